@@ -5,34 +5,37 @@ if hasattr(sys.stdout, "reconfigure"):
 import streamlit as st
 import pandas as pd
 import numpy as np
-import traceback
 import datetime
+import html
+import math
+import importlib.util
 import logging
+import os
+import re
 import warnings
+from dataclasses import dataclass, fields, asdict, replace
+from functools import partial
 from io import BytesIO
 
 # Logging Konfiguration
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 
+# Optionale Bibliotheken werden erst bei Bedarf importiert (verkürzt den Kaltstart der App).
+# Beim Start wird nur geprüft, ob sie installiert sind.
+
 # Import für IRR Berechnung und Finanzmathematik
-try:
-    import numpy_financial as npf
-    IRR_ENABLED = True
-except ImportError:
-    IRR_ENABLED = False
-    npf = None
+IRR_ENABLED = importlib.util.find_spec("numpy_financial") is not None
+npf = None
 
 # Bibliotheken für PDF Export
-try:
-    from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, HRFlowable, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import cm
-    from reportlab.lib import colors
-    PDF_EXPORT_ENABLED = True
-except ImportError:
-    PDF_EXPORT_ENABLED = False
+PDF_EXPORT_ENABLED = importlib.util.find_spec("reportlab") is not None
+REPORTLAB_LOADED = False
+# PDF-Stile (Absatz- und Tabellenstile) werden nach dem Laden von reportlab einmal je Skriptlauf erzeugt
+# (beim PDF-Export) und dann von allen Seiten, Fußzeilen und Tabellen des Berichts geteilt
+PDF_STYLES = None
+PDF_TABLE_STYLE_KPI = PDF_TABLE_STYLE_KPI_DETAIL = PDF_TABLE_STYLE_INV = PDF_TABLE_STYLE_DATAFRAME = None
 
 # --- SETUP & KONFIGURATION ---
 try:
@@ -65,6 +68,46 @@ KFW_ANNUITAET = "Annuitätendarlehen"
 KFW_ENDFAELLIG = "Endfälliges Darlehen"
 KFW_DARLEHENSTYPEN = [KFW_ANNUITAET, KFW_ENDFAELLIG]
 
+# Spalten der Projektionsrechnung (Reihenfolge = Spalten im projection_df) und deren Indizes im Projektions-Array
+PROJECTION_COLUMNS = [
+    'Mieteinnahmen (Netto)', 'Betriebskosten', 'Einnahmenüberschuss', 'Immobilienwert',
+    'Zins Bank', 'Tilgung Bank', 'Restschuld Bank',
+    'Zins KfW', 'Tilgung KfW', 'Restschuld KfW',
+    'Zinsen Gesamt', 'Tilgung Gesamt', 'Annuität Gesamt', 'Restschuld Gesamt',
+    'AfA Denkmal (Sonder)', 'AfA Altbau (Linear)', 'AfA Gesamt',
+    'Steuerliches Ergebnis (V+V)', 'Steuerersparnis',
+    'Cashflow vor Steuer', 'Sonderzufluss', 'Cashflow nach Steuer', 'Nettovermögen',
+]
+(
+    COL_MIETEINNAHMEN, COL_BETRIEBSKOSTEN, COL_UEBERSCHUSS, COL_IMMOBILIENWERT,
+    COL_ZINS_BANK, COL_TILGUNG_BANK, COL_RESTSCHULD_BANK,
+    COL_ZINS_KFW, COL_TILGUNG_KFW, COL_RESTSCHULD_KFW,
+    COL_ZINSEN_GESAMT, COL_TILGUNG_GESAMT, COL_ANNUITAET_GESAMT, COL_RESTSCHULD_GESAMT,
+    COL_AFA_DENKMAL, COL_AFA_ALTBAU, COL_AFA_GESAMT,
+    COL_STEUERLICHES_ERGEBNIS, COL_STEUERERSPARNIS,
+    COL_CASHFLOW_VOR_STEUER, COL_SONDERZUFLUSS, COL_CASHFLOW_NACH_STEUER, COL_NETTOVERMOEGEN,
+) = range(len(PROJECTION_COLUMNS))
+# Spalten mit jährlicher Steigerung (Miete, Kosten, Immobilienwert) und deren erster Exponent
+WACHSTUM_SPALTEN = [COL_MIETEINNAHMEN, COL_BETRIEBSKOSTEN, COL_IMMOBILIENWERT]
+WACHSTUM_STARTJAHRE = np.array([0, 0, 1])
+# Spaltenauswahl der Ergebnistabellen (UI und PDF); alle Spalten sind Teil von PROJECTION_COLUMNS
+CASHFLOW_SPALTEN = [
+    'Mieteinnahmen (Netto)', 'Betriebskosten', 'Einnahmenüberschuss',
+    'Annuität Gesamt', 'Cashflow vor Steuer', 'Steuerersparnis', 'Sonderzufluss', 'Cashflow nach Steuer'
+]
+FINANZIERUNG_SPALTEN = [
+    'Zins Bank', 'Tilgung Bank', 'Restschuld Bank',
+    'Zins KfW', 'Tilgung KfW', 'Restschuld KfW',
+    'Zinsen Gesamt', 'Tilgung Gesamt', 'Restschuld Gesamt'
+]
+STEUER_SPALTEN = [
+    'Einnahmenüberschuss', 'Zinsen Gesamt',
+    'AfA Denkmal (Sonder)', 'AfA Altbau (Linear)', 'AfA Gesamt',
+    'Steuerliches Ergebnis (V+V)', 'Steuerersparnis'
+]
+STEUER_SPALTEN_PDF = ['Einnahmenüberschuss', 'Zinsen Gesamt', 'AfA Gesamt', 'Steuerliches Ergebnis (V+V)', 'Steuerersparnis']
+VERMOEGEN_SPALTEN = ['Immobilienwert', 'Restschuld Gesamt', 'Nettovermögen']
+
 
 # Anpassung für das Datum und Steuerjahre
 MIN_STEUERJAHR = 2024
@@ -77,8 +120,8 @@ except Exception:
     except:
         CURRENT_YEAR = 2025 # Sicherer Fallback
 
-STEUERJAHRE_OPTIONEN = list(range(MIN_STEUERJAHR, max(MIN_STEUERJAHR + 1, CURRENT_YEAR + 2)))
-STEUERJAHRE_OPTIONEN.sort(reverse=True)
+# Absteigend (neuestes Jahr zuerst) direkt als rückwärts laufende range erzeugt
+STEUERJAHRE_OPTIONEN = list(range(max(MIN_STEUERJAHR + 1, CURRENT_YEAR + 2) - 1, MIN_STEUERJAHR - 1, -1))
 STEUERJAHR_DEFAULT = 2024
 
 
@@ -88,20 +131,28 @@ KIRCHENSTEUER_MAP = {
     "9% (Wohnsitz andere BL)": 0.09
 }
 KIRCHENSTEUER_DEFAULT = "9% (Wohnsitz andere BL)"
+# NEU: Brutto-Faktor (Soli + Kirchensteuer) je Option; run_calculations braucht so nur noch einen Lookup statt der Dict-Arithmetik je Aufruf
+KIST_BRUTTO_FACTOR = {key: 1 + SOLI_ZUSCHLAG + satz for key, satz in KIRCHENSTEUER_MAP.items()}
 STEUER_MODI = ['Basis Einkommen (zvE)', 'Steuersatz']
 
 COLOR_PRIMARY = "#3b6c36"
 COLOR_SECONDARY = "#b29d6e"
 COLOR_LIGHT_BG = "#e9f5e7"
 
-RL_COLOR_PRIMARY = colors.HexColor(COLOR_PRIMARY) if PDF_EXPORT_ENABLED else None
-RL_COLOR_LIGHT_BG = colors.HexColor(COLOR_LIGHT_BG) if PDF_EXPORT_ENABLED else None
+# Werden beim ersten PDF-Export in ensure_reportlab() gesetzt
+RL_COLOR_PRIMARY = None
+RL_COLOR_LIGHT_BG = None
 
 PDF_DISCLAIMER_TEXT = (
     "Disclaimer: Diese Berechnung dient Ihrer Orientierung und basiert auf den von Ihnen gemachten Angaben und Annahmen. "
     "Steuerliche Vorteile, KfW-Förderungen, kommunale Zuschüsse und Kostenansätze sind beispielhaft und können abweichen. "
     "Alle Ergebnisse erfolgen ohne Gewähr. Eine rechtliche, steuerliche oder finanzielle Beratung wird ausdrücklich nicht erbracht."
 )
+# Im PDF-Dateinamen unzulässige Zeichen (erlaubt: Buchstaben, Ziffern, Leerzeichen, '-', '_')
+PDF_DATEINAME_UNZULAESSIG = re.compile(r'[^\w \-]')
+
+# Objektdaten (Objektauswahl aus Liste)
+OBJEKTDATEN_CSV = "2025-10-25_Park 55_Rohdaten_Denkmalrechner App_final.csv"
 
 # Konstanten für Input Modus
 MODE_MANUAL = "Manuelle Eingabe"
@@ -110,6 +161,14 @@ MODE_LIST = "Objektauswahl aus Liste"
 # Konstanten für Erwerbsmodell
 MODELL_KAUF_GU = "Kauf & GU-Vertrag (Getrennte Verträge)"
 
+# Statische UI-Texte. Streamlit entfernt Elemente, die in einem Rerun nicht erneut ausgegeben werden,
+# daher werden sie bei jedem Rerun gesendet (Trenner und Überschrift zusammen als ein Markdown-Element).
+ERWERBSMODELL_HEADER_MD = f"---\n### Erwerbsmodell: {MODELL_KAUF_GU}"
+# Statischer Kopf der Spalte 2 (Überschrift + Label Kommunale Fördermittel) als ein Markdown-Element
+FINANZIERUNG_HEADER_MD = "### 2. Finanzierung & Steuern\n**Fördermittel (Zuschüsse):**"
+# GEÄNDERT (Punkt 4): Text angepasst
+ERWERBSMODELL_HINWEIS = "Dieser Rechner kann nur für das \"Kauf + GU-Modell\" verwendet werden, nicht für \"Bauträger-Modelle\" (u.a. wegen der Kalkulation der Kauferwerbsnebenkosten)."
+
 
 # Defaults
 DEFAULTS = {
@@ -163,6 +222,164 @@ DEFAULTS = {
     'miete_stellplatz': 40.00,
 }
 
+
+@dataclass(frozen=True, slots=True)
+class CalcInputs:
+    """Unveränderlicher Snapshot aller Berechnungs-Inputs (einmal pro Rerun aus dem Session State gelesen)."""
+    # Objektdaten
+    objekt_name: str
+    input_sanierungskosten_vor_zuschuss: float
+    input_gik_netto: float
+    input_sanierungskostenanteil_pct: float
+    input_grundstuecksanteil_pct: float
+    input_altbauanteil_pct: float
+    input_wohnflaeche: float
+    input_anzahl_whg: int
+    input_kellerflaeche: float
+    input_anzahl_stellplaetze: int
+    input_kommunale_foerderung: float
+    input_kfw_foerderfaehige_kosten: float
+    input_kfw_darlehen_261_basis: float
+    kosten_baubegleitung_pro_we: float
+    erwerbsmodell: str
+
+    # Finanzierung
+    ek_quote_pct: float
+    bank_zins_pct: float
+    bank_tilgung_pct: float
+    kfw_darlehenstyp: str
+    kfw_zins_pct: float
+    kfw_gesamtlaufzeit: int
+    kfw_tilgungsfreie_jahre: int
+
+    # Steuern
+    steuer_modus: str
+    zve: float
+    steuersatz_manuell_pct: float
+    steuertabelle: str
+    kirchensteuer_option: str
+    steuerjahr: int
+    geplanter_verkauf: int
+
+    # Parameter & Prognose
+    sicherheitsabschlag_pct: float
+    mietsteigerung_pa_pct: float
+    kostensteigerung_pa_pct: float
+    wertsteigerung_pa_pct: float
+    nk_pro_wohnung: float
+    miete_wohnen: float
+    miete_keller: float
+    miete_stellplatz: float
+
+
+CALC_KEYS = tuple(f.name for f in fields(CalcInputs))
+
+# Prozent-Inputs (_pct) und die Namen ihrer Dezimal-Pendants in params (auf Modulebene statt bei jeder Umrechnung)
+PCT_KEYS = (
+    'input_sanierungskostenanteil_pct', 'input_grundstuecksanteil_pct', 'input_altbauanteil_pct',
+    'ek_quote_pct', 'bank_zins_pct', 'bank_tilgung_pct', 'kfw_zins_pct',
+    'steuersatz_manuell_pct', 'sicherheitsabschlag_pct',
+    'mietsteigerung_pa_pct', 'kostensteigerung_pa_pct', 'wertsteigerung_pa_pct'
+)
+PCT_KEY_MAP = {key: key.replace('_pct', '') for key in PCT_KEYS}
+
+# Numerische Inputs nach Zieltyp (aus den Annotationen von CalcInputs), für die einmalige Typ-Normalisierung
+FLOAT_KEYS = tuple(f.name for f in fields(CalcInputs) if f.type is float)
+INT_KEYS = tuple(f.name for f in fields(CalcInputs) if f.type is int)
+
+# Inputs ohne Einfluss auf das Rechenergebnis (nur Anzeige/PDF); sie gehen nicht in den Cache-Key der Berechnung ein
+UI_ONLY_KEYS = ('objekt_name', 'erwerbsmodell', 'zve', 'steuertabelle', 'steuerjahr')
+UI_ONLY_NEUTRAL = {key: DEFAULTS[key] for key in UI_ONLY_KEYS}
+
+# ====================================================================================
+# OPTIONALE ABHÄNGIGKEITEN (LAZY IMPORT)
+# ====================================================================================
+
+def ensure_numpy_financial():
+    """Importiert numpy_financial beim ersten Gebrauch. Gibt zurück, ob es verfügbar ist."""
+    global npf, IRR_ENABLED
+    if npf is None and IRR_ENABLED:
+        try:
+            import numpy_financial as npf
+        except ImportError:
+            IRR_ENABLED = False
+    return IRR_ENABLED
+
+
+def ensure_reportlab():
+    """Importiert reportlab beim ersten PDF-Export. Gibt zurück, ob der PDF Export verfügbar ist."""
+    global A4, landscape, SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, HRFlowable, PageBreak
+    global getSampleStyleSheet, ParagraphStyle, cm, colors
+    global RL_COLOR_PRIMARY, RL_COLOR_LIGHT_BG, PDF_EXPORT_ENABLED, REPORTLAB_LOADED
+    if REPORTLAB_LOADED or not PDF_EXPORT_ENABLED:
+        return PDF_EXPORT_ENABLED
+    try:
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, HRFlowable, PageBreak
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import cm
+        from reportlab.lib import colors
+    except ImportError:
+        PDF_EXPORT_ENABLED = False
+        return False
+
+    RL_COLOR_PRIMARY = colors.HexColor(COLOR_PRIMARY)
+    RL_COLOR_LIGHT_BG = colors.HexColor(COLOR_LIGHT_BG)
+    build_pdf_styles()
+    REPORTLAB_LOADED = True
+    return True
+
+
+def build_pdf_styles():
+    """Erzeugt die (unveränderlichen) Absatz- und Tabellenstile des PDF-Berichts nach dem reportlab-Import (einmal je Skriptlauf)."""
+    global PDF_STYLES, PDF_TABLE_STYLE_KPI, PDF_TABLE_STYLE_KPI_DETAIL, PDF_TABLE_STYLE_INV, PDF_TABLE_STYLE_DATAFRAME
+    PDF_STYLES = getSampleStyleSheet()
+    PDF_STYLES.add(ParagraphStyle(name='TitleStyle', fontSize=18, leading=22, spaceAfter=12, fontName='Helvetica-Bold', textColor=RL_COLOR_PRIMARY))
+    PDF_STYLES.add(ParagraphStyle(name='HeaderStyle', fontSize=14, leading=18, spaceAfter=10, fontName='Helvetica-Bold', textColor=RL_COLOR_PRIMARY))
+    PDF_STYLES.add(ParagraphStyle(name='NormalStyle', fontSize=10, leading=14))
+    PDF_STYLES.add(ParagraphStyle(name='SmallStyle', fontSize=8, leading=12))
+    PDF_STYLES.add(ParagraphStyle(name='FooterStyle', parent=PDF_STYLES['Normal'], fontSize=8, leading=10, textColor=colors.grey, alignment=0))
+
+    PDF_TABLE_STYLE_KPI = TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), RL_COLOR_PRIMARY),
+        ('TEXTCOLOR',(0,0),(-1,0),colors.white),
+        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0,0), (-1,0), 12),
+        ('BACKGROUND', (0,1), (-1,-1), RL_COLOR_LIGHT_BG),
+        ('GRID', (0,0), (-1,-1), 1, colors.grey)
+    ])
+    PDF_TABLE_STYLE_KPI_DETAIL = TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), RL_COLOR_PRIMARY),
+        ('TEXTCOLOR',(0,0),(-1,0),colors.white),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('ALIGN', (1,1), (1,-1), 'RIGHT'),
+        ('ALIGN', (3,1), (3,-1), 'RIGHT'),
+        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+        ('SPAN', (2,3), (3,3)),
+    ])
+    PDF_TABLE_STYLE_INV = TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), RL_COLOR_PRIMARY),
+        ('TEXTCOLOR',(0,0),(-1,0),colors.white),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTNAME', (0,4), (-1,4), 'Helvetica-Bold'),
+        ('FONTNAME', (0,6), (-1,6), 'Helvetica-Bold'),
+        ('ALIGN', (1,0), (1,-1), 'RIGHT'),
+        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+        ('SPAN', (0,6), (1,6)),
+    ])
+    # Basis der Detailtabellen; zeilenabhängige Hintergründe werden je Tabelle auf einer Kopie ergänzt
+    PDF_TABLE_STYLE_DATAFRAME = TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), RL_COLOR_PRIMARY),
+        ('TEXTCOLOR',(0,0),(-1,0),colors.white),
+        ('ALIGN', (1,0), (-1,-1), 'RIGHT'),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,-1), 9),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 5),
+        ('TOPPADDING', (0,0), (-1,-1), 5),
+        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+    ])
+
 # ====================================================================================
 # DATENMANAGEMENT & SESSION STATE
 # ====================================================================================
@@ -198,87 +415,116 @@ def robust_parse_float(value):
         return 0.0
 
 
-@st.cache_data
-def load_object_data():
+def parse_float_column(series):
+    """Parst eine String-Spalte der CSV zu einem float64-Array."""
+    return series.map(robust_parse_float).to_numpy(dtype=np.float64)
+
+
+def objektdaten_mtime():
+    """Änderungszeitpunkt der Objektdaten-CSV (Teil der Cache-Keys), None falls nicht vorhanden."""
+    try:
+        return os.path.getmtime(OBJEKTDATEN_CSV)
+    except OSError:
+        return None
+
+
+def load_object_index():
+    """Liefert die Objektdaten als Dict Objektname -> Datensatz für den direkten Zugriff in Callbacks."""
+    return build_object_index(OBJEKTDATEN_CSV, objektdaten_mtime())
+
+
+# cache_resource: Der Index wird nur lesend genutzt, daher ohne Kopie bei jedem Zugriff
+@st.cache_resource(show_spinner=False)
+def build_object_index(file_path, file_mtime):
+    """Baut den Namensindex einmalig aus den bereinigten Objektdaten auf."""
+    object_index = {}
+    for row in parse_object_data(file_path, file_mtime).to_dict('records'):
+        # Bei doppelten Namen gilt (wie bisher) der erste Datensatz
+        object_index.setdefault(row['Objektname'], row)
+    return object_index
+
+
+# persist="disk": Das bereinigte Ergebnis überlebt Neustarts des Servers, der Kaltstart spart das CSV-Parsing.
+# Der Änderungszeitpunkt der Datei ist Teil des Cache-Keys, damit eine aktualisierte CSV neu eingelesen wird.
+@st.cache_data(persist="disk", show_spinner=False)
+def parse_object_data(file_path, file_mtime):
     """Lädt und bereinigt die Objektdaten aus der CSV-Datei."""
 
-    file_path = "2025-10-25_Park 55_Rohdaten_Denkmalrechner App_final.csv"
-    logging.info(f"Versuche, Objektdaten von {file_path} zu laden...")
+    logger.info("Versuche, Objektdaten von %s zu laden...", file_path)
     try:
         # Lese alles als String, um Parsing-Fehler durch gemischte Formate zu vermeiden.
         df_raw = pd.read_csv(file_path, delimiter=';', encoding='utf-8', dtype=str)
     except FileNotFoundError:
-        logging.warning(f"Objektdaten-Datei nicht gefunden: '{file_path}'.")
+        logger.warning("Objektdaten-Datei nicht gefunden: '%s'.", file_path)
         return pd.DataFrame()
     except Exception as e:
-        logging.error(f"Allgemeiner Fehler beim Laden der CSV: {e}")
+        logger.error("Allgemeiner Fehler beim Laden der CSV: %s", e)
         return pd.DataFrame()
 
     # --- Datenbereinigung und Transformation ---
-    df = pd.DataFrame()
+    # Spalten werden als fertig typisierte Arrays gesammelt und erst am Ende zu einem DataFrame zusammengesetzt.
 
     # Filtern von leeren Zeilen am Ende (z.B. die Summenzeile im Beispiel-CSV)
     df_raw = df_raw[df_raw['Objekt_ID'].notna() & (df_raw['Objekt_ID'].str.strip() != '')]
 
     try:
         # Sicherstellen, dass Hausnummer String ist
-        df_raw['Hausnummer'] = df_raw['Hausnummer'].fillna('')
-        df['Objektname'] = df_raw['Strasse'] + " " + df_raw['Hausnummer'] + " (" + df_raw['Objekt_ID'] + ")"
+        hausnummer = df_raw['Hausnummer'].fillna('')
+        daten = {'Objektname': df_raw['Strasse'] + " " + hausnummer + " (" + df_raw['Objekt_ID'] + ")"}
     except KeyError as e:
-        logging.error(f"CSV-Datei fehlen notwendige Spalten für den Objektnamen: {e}")
+        logger.error("CSV-Datei fehlen notwendige Spalten für den Objektnamen: %s", e)
         return pd.DataFrame()
 
     # 1. Basisdaten (Flächen/Einheiten) parsen
     try:
-        df['Wohnflaeche'] = df_raw['Wohnflaeche_neu_qm'].apply(robust_parse_float)
-        df['Anzahl_Whg'] = df_raw['Anzahl_Wohneinheiten'].apply(robust_parse_float).astype(int)
-        df['Kellerflaeche'] = df_raw['Kellerflaeche_qm'].apply(robust_parse_float)
-        df['Anzahl_Stellplaetze'] = df_raw['Anzahl_Stellplaetze'].apply(robust_parse_float).astype(int)
+        daten['Wohnflaeche'] = parse_float_column(df_raw['Wohnflaeche_neu_qm'])
+        # Mindestens 1 Wohneinheit (vektorisiert statt apply(lambda x: max(1, x)))
+        daten['Anzahl_Whg'] = np.maximum(parse_float_column(df_raw['Anzahl_Wohneinheiten']).astype(int), 1)
+        daten['Kellerflaeche'] = parse_float_column(df_raw['Kellerflaeche_qm'])
+        daten['Anzahl_Stellplaetze'] = parse_float_column(df_raw['Anzahl_Stellplaetze']).astype(int)
     except KeyError as e:
-        logging.error(f"Fehlende Basisspalten in CSV: {e}")
+        logger.error("Fehlende Basisspalten in CSV: %s", e)
         return pd.DataFrame()
 
     # 2. Finanzdaten und Anteile parsen (NEU)
 
     # GIK Netto
     if 'GIK_netto' in df_raw.columns:
-        df['GIK_netto'] = df_raw['GIK_netto'].apply(robust_parse_float)
+        daten['GIK_netto'] = parse_float_column(df_raw['GIK_netto'])
     else:
-        df['GIK_netto'] = 0
+        daten['GIK_netto'] = 0
 
     # Anteile (Prozentwerte XX.XX)
     if 'SanAnteil_netto' in df_raw.columns:
-        df['Sanierungskostenanteil_Pct'] = df_raw['SanAnteil_netto'].apply(robust_parse_float)
+        daten['Sanierungskostenanteil_Pct'] = parse_float_column(df_raw['SanAnteil_netto'])
     else:
-        df['Sanierungskostenanteil_Pct'] = DEFAULTS['input_sanierungskostenanteil_pct']
+        daten['Sanierungskostenanteil_Pct'] = DEFAULTS['input_sanierungskostenanteil_pct']
 
     if 'Grund_Boden' in df_raw.columns:
-        df['Grundstuecksanteil_Pct'] = df_raw['Grund_Boden'].apply(robust_parse_float)
+        daten['Grundstuecksanteil_Pct'] = parse_float_column(df_raw['Grund_Boden'])
     else:
-        df['Grundstuecksanteil_Pct'] = DEFAULTS['input_grundstuecksanteil_pct']
+        daten['Grundstuecksanteil_Pct'] = DEFAULTS['input_grundstuecksanteil_pct']
 
     # Kommunale Förderung (Punkt 2)
     if 'Kommunale_Foerderung_Betrag' in df_raw.columns:
-        basis = df_raw['Kommunale_Foerderung_Betrag'].apply(robust_parse_float)
         # Wende 40% Faktor an
-        df['Kommunale_Foerderung_Zuschuss'] = basis * KOMMUNALE_FOERDERUNG_FAKTOR
+        daten['Kommunale_Foerderung_Zuschuss'] = parse_float_column(df_raw['Kommunale_Foerderung_Betrag']) * KOMMUNALE_FOERDERUNG_FAKTOR
     else:
-        df['Kommunale_Foerderung_Zuschuss'] = 0
-
+        daten['Kommunale_Foerderung_Zuschuss'] = 0
 
     # --- Nachbearbeitung und Typsicherheit ---
-    df['Anzahl_Whg'] = df['Anzahl_Whg'].apply(lambda x: max(1, x))
+    df = pd.DataFrame(daten, index=df_raw.index)
     df = df.dropna(subset=['Objektname'])
 
 
-    logging.info(f"Erfolgreich {len(df)} Objekte geladen.")
+    logger.info("Erfolgreich %d Objekte geladen.", len(df))
     return df
 
 
 def initialize_session_state():
     """Initialisiert den Streamlit Session State mit Default-Werten."""
     if 'initialized' not in st.session_state:
-        logging.info("Initialisiere Session State...")
+        logger.info("Initialisiere Session State...")
         for key, value in DEFAULTS.items():
             if key not in st.session_state:
                 st.session_state[key] = value
@@ -287,8 +533,14 @@ def initialize_session_state():
 
         st.session_state['input_mode'] = MODE_MANUAL
         st.session_state['selected_object'] = None
+        st.session_state['_last_applied_object'] = None
         st.session_state['initialized'] = True
 
+def gather_calc_inputs():
+    """Bündelt alle für die Berechnung relevanten Werte aus dem Session State in einem CalcInputs-Objekt."""
+    # Fallback auf DEFAULTS, da Streamlit den State nicht angezeigter Widgets (z.B. zvE im Modus 'Steuersatz') entfernt
+    return CalcInputs(**{key: st.session_state.get(key, DEFAULTS.get(key)) for key in CALC_KEYS})
+
 # Callback für Moduswechsel (Radio Button)
 def handle_mode_change():
     """Wird aufgerufen, wenn der Radio Button (Manuell vs Liste) geändert wird."""
@@ -296,21 +548,37 @@ def handle_mode_change():
         st.session_state.selected_object = None
         update_state_from_selection()
     elif st.session_state.input_mode == MODE_LIST:
-        df = load_object_data()
-        if not df.empty:
-            if st.session_state.selected_object is None or st.session_state.selected_object not in df['Objektname'].values:
-                st.session_state.selected_object = df['Objektname'].iloc[0]
+        object_index = load_object_index()
+        if object_index:
+            if st.session_state.selected_object not in object_index:
+                st.session_state.selected_object = next(iter(object_index))
             update_state_from_selection()
 
 # Callback für Änderung der Anzahl Wohnungen (Manuelle Eingabe)
 def handle_anzahl_whg_change():
-    """Aktualisiert das maximale KfW-Darlehen, wenn die Anzahl WE manuell geändert wird."""
+    """Aktualisiert das maximale KfW-Darlehen, wenn die Anzahl WE geändert wird."""
+    anzahl_whg = int(st.session_state.get('input_anzahl_whg', 1))
+    max_kfw_darlehen_basis = anzahl_whg * KFW_LIMIT_PRO_WE_BASIS
     if st.session_state.get('input_mode') == MODE_MANUAL:
-        anzahl_whg = st.session_state.get('input_anzahl_whg', 1)
-        max_kfw_darlehen_basis = anzahl_whg * KFW_LIMIT_PRO_WE_BASIS
         st.session_state.input_kfw_darlehen_261_basis = int(max_kfw_darlehen_basis)
         # Setzt auch förderfähige Kosten zurück, da manuell geändert wird
         st.session_state.input_kfw_foerderfaehige_kosten = 0
+    else:
+        # Robustheits-Fix: Darlehenssumme auf das neue Maximum begrenzen (nur bei Änderung der WE nötig)
+        current_kfw_value = st.session_state.get('input_kfw_darlehen_261_basis', DEFAULTS['input_kfw_darlehen_261_basis'])
+        st.session_state.input_kfw_darlehen_261_basis = int(min(current_kfw_value, max_kfw_darlehen_basis))
+
+# Callback für Änderung von KfW-Laufzeit oder Darlehenstyp
+def handle_kfw_laufzeit_change():
+    """Begrenzt die tilgungsfreien Jahre auf Laufzeit - 1 (Annuität) bzw. setzt sie auf 0 (endfällig)."""
+    if st.session_state.get('kfw_darlehenstyp') == KFW_ANNUITAET:
+        max_tilgungsfrei = max(0, st.session_state.get('kfw_gesamtlaufzeit', DEFAULTS['kfw_gesamtlaufzeit']) - 1)
+        current_tilgungsfrei = st.session_state.get('kfw_tilgungsfreie_jahre', 0)
+        if current_tilgungsfrei > max_tilgungsfrei:
+            st.session_state.kfw_tilgungsfreie_jahre = max_tilgungsfrei
+    else:
+        # Bei endfällig sicherstellen, dass der Wert intern 0 ist
+        st.session_state.kfw_tilgungsfreie_jahre = 0
 
 # NEU (Punkt 4): Callback für Änderung der Förderfähigen Kosten
 def handle_kfw_foerderfaehig_change():
@@ -340,7 +608,11 @@ def update_state_from_selection():
     NEU: Lädt nun auch Finanzdaten aus der CSV.
     """
     selected_name = st.session_state.get('selected_object')
-    df = load_object_data()
+
+    # Auswahl wurde bereits übernommen (z.B. doppelt ausgelöster Callback) -> State nicht erneut überschreiben
+    if selected_name == st.session_state.get('_last_applied_object'):
+        return
+
     current_mode = st.session_state.get('input_mode')
 
     if selected_name is None or current_mode == MODE_MANUAL:
@@ -357,12 +629,11 @@ def update_state_from_selection():
             'Kommunale_Foerderung_Zuschuss': DEFAULTS['input_kommunale_foerderung']
         }
 
-    elif not df.empty and selected_name in df['Objektname'].values:
-        # Lade Daten aus der CSV für das ausgewählte Objekt
-        target_data = df[df['Objektname'] == selected_name].iloc[0].to_dict()
-
     else:
-        return
+        # Lade Daten aus der CSV für das ausgewählte Objekt (direkter Zugriff über den Namensindex)
+        target_data = load_object_index().get(selected_name)
+        if target_data is None:
+            return
 
     # 1. Aktualisiere Basisdaten im State
     st.session_state.objekt_name = target_data.get('Objektname', '')
@@ -391,18 +662,23 @@ def update_state_from_selection():
 
     st.session_state.kosten_baubegleitung_pro_we = KOSTEN_BB_PRO_WE_DEFAULT
 
+    st.session_state['_last_applied_object'] = selected_name
+
 # ====================================================================================
 # HILFSFUNKTIONEN & FORMATIERUNG
 # ====================================================================================
 
+# Übersetzungstabelle EN -> DE Zahlenformat: str.translate ersetzt alle Zeichen gleichzeitig,
+# daher ist kein Platzhalter ('X') für den Tausch von Dezimal- und Tausendertrennzeichen nötig.
+DE_NUMBER_TRANS = str.maketrans(',.', '.,')
+
 def format_euro(value, decimals=2):
     try:
         if pd.isna(value): return "-"
         value = float(value)
         if decimals == 0:
-            return f"{int(round(value, 0)):,} €".replace(',', '.')
-        else:
-            return f"{value:,.{decimals}f} €".replace(',', 'X').replace('.', ',').replace('X', '.')
+            return f"{int(round(value, 0)):,} €".translate(DE_NUMBER_TRANS)
+        return f"{value:,.{decimals}f} €".translate(DE_NUMBER_TRANS)
     except (ValueError, TypeError):
         return "0,00 €" if decimals==2 else "0 €"
 
@@ -413,36 +689,50 @@ def format_percent(value, decimals=2):
         value = float(value)
         if decimals == 0:
             return f"{int(round(value*100, 0))} %"
-        return f"{value*100:,.{decimals}f} %".replace(',', 'X').replace('.', ',').replace('X', '.')
+        return f"{value*100:,.{decimals}f} %".translate(DE_NUMBER_TRANS)
      except (ValueError, TypeError):
         return "0,00 %"
 
 def format_aligned_line(label, value_str, label_width=28):
     return f"{label:<{label_width}}{value_str:>15}"
 
+def display_breakdown(zeilen):
+    """Gibt einen Berechnungsblock als ein einziges Markdown-Element aus (Zeilen mit '=' als Zwischensumme)."""
+    # Ohne Zeilenumbrüche zwischen den Zeilen-Divs (white-space: pre würde sie als Leerzeilen darstellen)
+    inhalt = "".join(
+        f'<div class="breakdown-intermediate">{html.escape(zeile)}</div>' if zeile.startswith("=") else f'<div>{html.escape(zeile)}</div>'
+        for zeile in zeilen
+    )
+    st.markdown(f'<div class="calculation-breakdown">{inhalt}</div>', unsafe_allow_html=True)
+
 # Helper function for annuity calculation (needed for the new KfW logic)
 def calculate_annuity(principal, rate, periods):
     """Berechnet die Annuität für ein Darlehen."""
     if principal <= 0 or periods <= 0:
         return 0
 
-    # Nutze numpy_financial wenn verfügbar
-    if IRR_ENABLED:
-        try:
-            return -npf.pmt(rate, periods, principal)
-        except Exception as e:
-            logging.error(f"Fehler bei npf.pmt Berechnung: {e}. Nutze Fallback.")
-
-    # Manueller Fallback
+    # Geschlossene Annuitätenformel (entspricht -npf.pmt, ohne dessen Array-Overhead)
     if rate == 0:
         return principal / periods
     else:
         q = 1 + rate
         return principal * (q**periods * (q-1)) / (q**periods - 1)
 
+def growth_factors(rate, n, start=0):
+    """Wachstumsfaktoren (1 + rate)**t für t = start, ..., start + n - 1 (bei mehreren Raten eine Spalte je Rate)."""
+    # Kumulatives Produkt: eine Multiplikation pro Jahr statt einer pow-Berechnung je Element
+    basis = 1.0 + np.asarray(rate, dtype=np.float64)
+    faktoren = np.empty((n,) + basis.shape)
+    faktoren[...] = basis
+    faktoren[0] = basis ** start
+    return np.cumprod(faktoren, axis=0, out=faktoren)
+
 # --- VALIDIERUNGSLOGIK ---
 
-def validate_gik_anteile(sanierung_pct, grundstueck_pct):
+# Reine Funktion (keine st.*-Aufrufe): Ergebnis hängt nur von den Argumenten ab und wird daher
+# über Reruns hinweg gecacht (st.cache_data überdauert die Neuausführung des Skripts, lru_cache nicht)
+@st.cache_data(show_spinner=False, max_entries=256)
+def validate_gik_anteile(sanierung_pct, grundstueck_pct, gik_netto=0):
     """Prüft, ob die GIK-Anteile (in Prozent) plausibel sind."""
     try:
         sanierung_pct = float(sanierung_pct)
@@ -458,9 +748,8 @@ def validate_gik_anteile(sanierung_pct, grundstueck_pct):
         return False, 0, "error", msg
 
     altbauanteil_pct = max(0.0, 100.0 - summe_anteile_pct) # Sicherstellen, dass es nicht negativ wird
-    st.session_state['input_altbauanteil_pct'] = altbauanteil_pct
 
-    if altbauanteil_pct < 5.0 and altbauanteil_pct >= 0 and st.session_state.get('input_gik_netto', 0) > 0:
+    if altbauanteil_pct < 5.0 and altbauanteil_pct >= 0 and gik_netto > 0:
         msg = f"Hinweis: Anteil Altbausubstanz ({altbauanteil_pct:.2f}%) ist sehr gering."
         return True, altbauanteil_pct, "warning", msg
 
@@ -584,8 +873,9 @@ def display_inputs():
 
     # --- Modusauswahl ---
 
-    df_objects = load_object_data()
-    if df_objects.empty:
+    # Namensindex (cache_resource) statt der gecachten DataFrame: keine Kopie der Objektdaten pro Rerun
+    object_index = load_object_index()
+    if not object_index:
         if st.session_state.input_mode != MODE_MANUAL:
              st.session_state.input_mode = MODE_MANUAL
              handle_mode_change()
@@ -602,13 +892,9 @@ def display_inputs():
         on_change=handle_mode_change
     )
 
-    # Erwerbsmodell
-    st.markdown("---")
-
-    # Statischer Text und geänderter Hinweistext
-    st.subheader(f"Erwerbsmodell: {MODELL_KAUF_GU}")
-    # GEÄNDERT (Punkt 4): Text angepasst
-    st.info("Dieser Rechner kann nur für das \"Kauf + GU-Modell\" verwendet werden, nicht für \"Bauträger-Modelle\" (u.a. wegen der Kalkulation der Kauferwerbsnebenkosten).")
+    # Erwerbsmodell: Statischer Block (Trennlinie + Überschrift als ein Element)
+    st.markdown(ERWERBSMODELL_HEADER_MD)
+    st.info(ERWERBSMODELL_HINWEIS)
     st.markdown("---")
 
 
@@ -624,11 +910,10 @@ def display_inputs():
 
         # 1.1 Objektauswahl
         if st.session_state.input_mode == MODE_LIST:
-            if not df_objects.empty:
-                object_options = df_objects['Objektname'].tolist()
+            if object_index:
                 st.selectbox(
                     "Objekt aus Liste wählen:",
-                    options=object_options,
+                    options=list(object_index),
                     key='selected_object',
                     on_change=update_state_from_selection
                 )
@@ -645,8 +930,12 @@ def display_inputs():
         # Validierungslogik
         gik_is_valid, altbauanteil_pct, msg_type, msg = validate_gik_anteile(
             st.session_state.input_sanierungskostenanteil_pct,
-            st.session_state.input_grundstuecksanteil_pct
+            st.session_state.input_grundstuecksanteil_pct,
+            st.session_state.get('input_gik_netto', 0)
         )
+        # Altbauanteil nur bei gültigen Anteilen und nur bei tatsächlicher Änderung in den Session State schreiben
+        if gik_is_valid and st.session_state.get('input_altbauanteil_pct') != altbauanteil_pct:
+            st.session_state['input_altbauanteil_pct'] = altbauanteil_pct
 
         if msg_type == "error":
             st.error(msg)
@@ -666,10 +955,8 @@ def display_inputs():
 
     # --- Spalte 2: KfW-Förderung, Finanzierung, Steuern ---
     with col2:
-        st.subheader("2. Finanzierung & Steuern")
-
-        # Kommunale Fördermittel
-        st.markdown("**Fördermittel (Zuschüsse):**")
+        # Überschrift und erstes Label als ein statisches Element
+        st.markdown(FINANZIERUNG_HEADER_MD)
         st.number_input("Kommunale Fördermittel (€)", min_value=0, step=1000, key='input_kommunale_foerderung')
 
         # NEU: Dynamischer Hinweis zur Kommunalen Förderung
@@ -683,33 +970,27 @@ def display_inputs():
         st.markdown("**KfW-Förderung (Programm 261):**")
         st.number_input("Kosten Baubegleitung (pro WE, €)", min_value=0, max_value=5000, step=1, format="%d", key='kosten_baubegleitung_pro_we')
 
-        # Berechnung des Max-Limits
+        # Berechnung des Max-Limits (einmal als int, genutzt für Label, max_value und Gesamtsumme)
         anzahl_whg = int(st.session_state.get('input_anzahl_whg', 1))
         max_kfw_darlehen_basis = anzahl_whg * KFW_LIMIT_PRO_WE_BASIS
+        kfw_darlehen_label = f"KfW-Darlehenssumme 261 (Max: {format_euro(max_kfw_darlehen_basis, 0)})"
 
         # NEU (Punkt 4): Input für Förderfähige Kosten (mit Callback)
         st.number_input("Förderfähige Kosten (KfW, €)", min_value=0, step=1000, key='input_kfw_foerderfaehige_kosten', on_change=handle_kfw_foerderfaehig_change)
         st.caption("Wenn > 0, bestimmt dieser Wert die Darlehenssumme (bis zum Limit).")
 
 
-        # Robustheits-Fix: Stellt sicher, dass der Wert nicht das Maximum überschreitet
-        current_kfw_value = st.session_state.get('input_kfw_darlehen_261_basis', DEFAULTS['input_kfw_darlehen_261_basis'])
-        if float(current_kfw_value) > max_kfw_darlehen_basis:
-            st.session_state.input_kfw_darlehen_261_basis = int(max_kfw_darlehen_basis)
-            current_kfw_value = max_kfw_darlehen_basis
-
         # GEÄNDERT (Punkt 4): Label umbenannt und Callback hinzugefügt
-        st.number_input(f"KfW-Darlehenssumme 261 (Max: {format_euro(int(max_kfw_darlehen_basis),0)})",
+        st.number_input(kfw_darlehen_label,
                         min_value=0,
-                        max_value=int(max_kfw_darlehen_basis),
+                        max_value=max_kfw_darlehen_basis,
                         step=1000,
                         key='input_kfw_darlehen_261_basis',
                         on_change=handle_kfw_darlehen_basis_change)
 
         # Info Gesamtdarlehen
-        current_kfw_value_from_input = st.session_state.input_kfw_darlehen_261_basis
-        kosten_bb_pro_we = float(st.session_state.get('kosten_baubegleitung_pro_we', 0))
-        kfw_gesamt = current_kfw_value_from_input + (kosten_bb_pro_we * anzahl_whg)
+        kosten_bb_pro_we = st.session_state.get('kosten_baubegleitung_pro_we', 0)
+        kfw_gesamt = st.session_state.input_kfw_darlehen_261_basis + kosten_bb_pro_we * anzahl_whg
         st.caption(f"Gesamt KfW-Darlehen (inkl. BB): {format_euro(kfw_gesamt, 0)}")
 
         # 2.2 Finanzierung
@@ -726,29 +1007,18 @@ def display_inputs():
         c_d2.markdown("**KfW-Darlehen (261):**")
 
         # NEU: Auswahl Darlehenstyp
-        c_d2.radio("Darlehenstyp", KFW_DARLEHENSTYPEN, key='kfw_darlehenstyp', horizontal=True)
+        c_d2.radio("Darlehenstyp", KFW_DARLEHENSTYPEN, key='kfw_darlehenstyp', horizontal=True, on_change=handle_kfw_laufzeit_change)
 
         c_d2.number_input("Zinssatz KfW (%)", min_value=0.0, step=0.01, format="%.2f", key='kfw_zins_pct')
 
         # Laufzeit Logik (NEU: Dynamisch basierend auf Typ)
         is_annuitaet = st.session_state.kfw_darlehenstyp == KFW_ANNUITAET
 
-        gesamtlaufzeit = st.session_state.kfw_gesamtlaufzeit
-
-        # Nur relevant für Annuität
-        if is_annuitaet:
-            max_tilgungsfrei = max(0, gesamtlaufzeit - 1)
-            # Stellt sicher, dass der Wert im gültigen Bereich bleibt, wenn Laufzeit geändert wird
-            if st.session_state.kfw_tilgungsfreie_jahre > max_tilgungsfrei:
-                st.session_state.kfw_tilgungsfreie_jahre = max_tilgungsfrei
-        else:
-            # Bei endfällig sicherstellen, dass der Wert intern 0 ist
-            st.session_state.kfw_tilgungsfreie_jahre = 0
-            max_tilgungsfrei = 0
-
         # NEU: Dynamisches Label für Laufzeit
+        # Die Begrenzung der tilgungsfreien Jahre erfolgt im Callback (nur bei Änderung von Laufzeit/Typ)
         laufzeit_label = "Gesamtlaufzeit (J.)" if is_annuitaet else "Laufzeit bis Fälligkeit (J.)"
-        c_d2.number_input(laufzeit_label, min_value=1, max_value=35, step=1, key='kfw_gesamtlaufzeit')
+        c_d2.number_input(laufzeit_label, min_value=1, max_value=35, step=1, key='kfw_gesamtlaufzeit', on_change=handle_kfw_laufzeit_change)
+        max_tilgungsfrei = max(0, st.session_state.kfw_gesamtlaufzeit - 1)
 
         # NEU: Tilgungsfrei nur anzeigen, wenn Annuität
         if is_annuitaet:
@@ -780,25 +1050,29 @@ def display_inputs():
 
 
     # --- Spalte 3: Parameter & Prognose (Slider) ---
-    # ... (Spalte 3 unverändert) ...
+    # Die Slider haben keine Callbacks und steuern keine anderen Widgets; sie liegen daher in einem Formular,
+    # damit das Verschieben mehrerer Regler nur einen Rerun (beim Übernehmen) statt einen pro Regler auslöst.
     with col3:
         st.subheader("3. Parameter & Prognose")
-        st.number_input("Geplanter Verkauf nach (Jahren)", min_value=10, step=1, key='geplanter_verkauf')
+        with st.form("prognose_form", border=False):
+            st.number_input("Geplanter Verkauf nach (Jahren)", min_value=10, step=1, key='geplanter_verkauf')
+
+            st.markdown("**Mieten (Startwerte):**")
+            st.slider("Miete Wohnen (€/m²)", min_value=8.0, max_value=12.50, step=0.1, format="%.2f €", key='miete_wohnen')
+            st.slider("Miete Keller (€/m²)", min_value=0.0, max_value=5.00, step=0.1, format="%.2f €", key='miete_keller')
+            st.slider("Miete Stellplatz (€/Stk.)", min_value=20.0, max_value=60.0, step=5.0, format="%.0f €", key='miete_stellplatz')
 
-        st.markdown("**Mieten (Startwerte):**")
-        st.slider("Miete Wohnen (€/m²)", min_value=8.0, max_value=12.50, step=0.1, format="%.2f €", key='miete_wohnen')
-        st.slider("Miete Keller (€/m²)", min_value=0.0, max_value=5.00, step=0.1, format="%.2f €", key='miete_keller')
-        st.slider("Miete Stellplatz (€/Stk.)", min_value=20.0, max_value=60.0, step=5.0, format="%.0f €", key='miete_stellplatz')
+            st.markdown("**Entwicklung (p.a. %):**")
+            st.slider("Mietsteigerung (%)", min_value=0.0, max_value=5.0, step=0.5, format="%.1f%%", key='mietsteigerung_pa_pct')
+            st.slider("Wertsteigerung (%)", min_value=0.0, max_value=10.0, step=0.5, format="%.1f%%", key='wertsteigerung_pa_pct')
 
-        st.markdown("**Entwicklung (p.a. %):**")
-        st.slider("Mietsteigerung (%)", min_value=0.0, max_value=5.0, step=0.5, format="%.1f%%", key='mietsteigerung_pa_pct')
-        st.slider("Wertsteigerung (%)", min_value=0.0, max_value=10.0, step=0.5, format="%.1f%%", key='wertsteigerung_pa_pct')
+            st.markdown("**Kosten:**")
+            st.slider("Verwaltung (€/Whg./Monat)", min_value=0.0, max_value=40.0, step=0.10, format="%.2f €", key='nk_pro_wohnung')
+            st.slider("Kostensteigerung (%)", min_value=0.0, max_value=5.0, step=0.5, format="%.1f%%", key='kostensteigerung_pa_pct')
 
-        st.markdown("**Kosten:**")
-        st.slider("Verwaltung (€/Whg./Monat)", min_value=0.0, max_value=40.0, step=0.10, format="%.2f €", key='nk_pro_wohnung')
-        st.slider("Kostensteigerung (%)", min_value=0.0, max_value=5.0, step=0.5, format="%.1f%%", key='kostensteigerung_pa_pct')
+            st.slider("Sicherheitsabschlag Miete (%)", min_value=0.0, max_value=20.0, step=1.0, format="%.0f%%", key='sicherheitsabschlag_pct')
 
-        st.slider("Sicherheitsabschlag Miete (%)", min_value=0.0, max_value=20.0, step=1.0, format="%.0f%%", key='sicherheitsabschlag_pct')
+            st.form_submit_button("Parameter übernehmen")
 
     st.markdown('</div>', unsafe_allow_html=True) # Schließe Wrapper
 
@@ -808,20 +1082,28 @@ def display_inputs():
 # BERECHNUNGSLOGIK (Kern der Anwendung)
 # ====================================================================================
 
-# ... (run_calculations, convert_inputs_to_params, calculate_investment, calculate_revenues_costs, calculate_projection bleiben strukturell gleich) ...
+# ... (run_calculations, convert_inputs_to_params, calculate_investment_revenues, calculate_projection bleiben strukturell gleich) ...
 
 def run_calculations(inputs_pct):
-    """Führt die gesamte Immobilienberechnung durch."""
+    """Führt die gesamte Immobilienberechnung durch (gecacht, ohne reine Anzeige-Felder im Cache-Key)."""
+    # Anzeige-Felder werden für den Cache neutralisiert und danach wieder in params eingesetzt,
+    # damit z.B. das Tippen des Objektnamens keine Neuberechnung auslöst.
+    results, params = run_calculations_cached(replace(inputs_pct, **UI_ONLY_NEUTRAL))
+    params.update({key: getattr(inputs_pct, key) for key in UI_ONLY_KEYS})
+    return results, params
+
+
+# Gecacht auf dem (hashbaren) CalcInputs-Snapshot: Reruns ohne geänderte Inputs überspringen die gesamte Berechnung.
+@st.cache_data(show_spinner=False, max_entries=128)
+def run_calculations_cached(inputs_pct):
+    """Berechnungspipeline (Investition, Mieten, Steuern, Projektion, KPIs) für einen CalcInputs-Snapshot."""
     results = {}
 
     # 1. Konvertiere Prozent-Inputs in Dezimalzahlen für die Berechnung
     params = convert_inputs_to_params(inputs_pct)
 
-    # 2. Investitionsrechnung
-    results = calculate_investment(params, results)
-
-    # 3. Mieten und Kosten
-    results = calculate_revenues_costs(params, results)
+    # 2./3. Investitionsrechnung sowie Mieten und Kosten (ein Durchlauf über die Eingaben)
+    results = calculate_investment_revenues(params, results)
 
     # 4. Steuerberechnung (Grenzsteuersatz)
     if params['steuer_modus'] == 'Steuersatz':
@@ -830,9 +1112,8 @@ def run_calculations(inputs_pct):
         # Platzhalter 42% (Wie besprochen, wird dies nicht dynamisch aus dem zvE berechnet)
         results['grenzsteuersatz_netto'] = 0.42
 
-    kirchensteuer_satz = KIRCHENSTEUER_MAP.get(params['kirchensteuer_option'], 0.0)
     # Berechnung des Brutto-Steuersatzes inkl. Soli und Kirchensteuer
-    results['grenzsteuersatz_brutto'] = results['grenzsteuersatz_netto'] * (1 + SOLI_ZUSCHLAG + kirchensteuer_satz)
+    results['grenzsteuersatz_brutto'] = results['grenzsteuersatz_netto'] * KIST_BRUTTO_FACTOR.get(params['kirchensteuer_option'], 1 + SOLI_ZUSCHLAG)
 
     # 5. Zeitreihenentwicklung
     results = calculate_projection(params, results)
@@ -843,47 +1124,70 @@ def run_calculations(inputs_pct):
     return results, params
 
 def convert_inputs_to_params(inputs_pct):
-    """Konvertiert die Prozent-Inputs (_pct) aus dem Session State in Dezimalzahlen."""
-    params = dict(inputs_pct)
-
-    pct_keys = [
-        'input_sanierungskostenanteil_pct', 'input_grundstuecksanteil_pct', 'input_altbauanteil_pct',
-        'ek_quote_pct', 'bank_zins_pct', 'bank_tilgung_pct', 'kfw_zins_pct',
-        'steuersatz_manuell_pct', 'sicherheitsabschlag_pct',
-        'mietsteigerung_pa_pct', 'kostensteigerung_pa_pct', 'wertsteigerung_pa_pct'
-    ]
+    """Konvertiert die Prozent-Inputs (_pct) aus dem CalcInputs-Snapshot in Dezimalzahlen."""
+    params = asdict(inputs_pct)
+    # Einmalige Typ-Normalisierung; die Rechenfunktionen nutzen die Werte danach ohne Casts
+    params.update({key: safe_float(params[key]) for key in FLOAT_KEYS})
+    params.update({key: safe_int(params[key], DEFAULTS.get(key, 0)) for key in INT_KEYS})
+    params.update({new_key: pct_to_decimal(params[key]) for key, new_key in PCT_KEY_MAP.items() if key in params})
+    return params
 
-    for key in pct_keys:
-        if key in params:
-            new_key = key.replace('_pct', '')
-            try:
-                value = params[key]
-                if value is None or value == '':
-                    params[new_key] = 0.0
-                else:
-                    params[new_key] = float(value) / 100.0
-            except (ValueError, TypeError):
-                params[new_key] = 0.0
 
-    return params
+def safe_float(value):
+    """Wandelt eine Eingabe in float um. Leere oder ungültige Werte ergeben 0.0."""
+    if value is None or value == '':
+        return 0.0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
 
 
-def calculate_investment(params, results):
-    """Berechnet GIK, Nebenkosten, AfA-Grundlagen und Finanzierungsstruktur."""
-    kommunale_foerderung = float(params.get('input_kommunale_foerderung', 0))
+def safe_int(value, default):
+    """Wandelt eine Eingabe in int um. Leere oder ungültige Werte ergeben den Default."""
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def pct_to_decimal(value):
+    """Wandelt einen Prozentwert (z.B. 4.2) in eine Dezimalzahl (0.042) um. Ungültige Werte ergeben 0.0."""
+    return safe_float(value) / 100.0
+
+
+def calculate_investment_revenues(params, results):
+    """Berechnet GIK, Nebenkosten, AfA-Grundlagen, Finanzierungsstruktur sowie Mieten und Kosten (Jahr 1)."""
+    # Eingaben einmalig in lokale Variablen lesen (bereits in convert_inputs_to_params typ-normalisiert)
+    kommunale_foerderung = params.get('input_kommunale_foerderung', 0.0)
+    wohnflaeche_saniert = params.get('input_wohnflaeche', 0.0)
+    sanierungskosten_vor_zuschuss = params.get('input_sanierungskosten_vor_zuschuss', 0.0)
+    anzahl_whg = params.get('input_anzahl_whg', 1)
+    kosten_bb_pro_we = params.get('kosten_baubegleitung_pro_we', float(KOSTEN_BB_PRO_WE_DEFAULT))
+    grundstuecksanteil_pct = params.get('input_grundstuecksanteil_pct', 8.0)
+    kfw_foerderfaehige_kosten = params.get('input_kfw_foerderfaehige_kosten', 0.0)
+    kfw_darlehen_261 = params.get('input_kfw_darlehen_261_basis', 0.0)
+    ek_quote = params['ek_quote']
+    kellerflaeche = params['input_kellerflaeche']
+    anzahl_stellplaetze = params['input_anzahl_stellplaetze']
+    miete_wohnen = params['miete_wohnen']
+    miete_keller = params['miete_keller']
+    miete_stellplatz = params['miete_stellplatz']
+    nk_pro_wohnung = params['nk_pro_wohnung']
+    sicherheitsabschlag = params['sicherheitsabschlag']
+
     results['kommunale_foerderung'] = kommunale_foerderung
-    wohnflaeche_saniert = float(params.get('input_wohnflaeche', 0))
     wohnflaeche_bestand = wohnflaeche_saniert / 1.4 if wohnflaeche_saniert > 0 else 0
     results['wohnflaeche_bestand'] = wohnflaeche_bestand
     results['wohnflaeche_saniert'] = wohnflaeche_saniert
     kaufpreis_bestand = wohnflaeche_bestand * 650
     results['kaufpreis_bestand'] = kaufpreis_bestand
-    erwerbsnebenkosten = kaufpreis_bestand * 0.065
+    # Erwerbsnebenkosten (GrESt + Notar/AG) fallen nur auf den Kaufpreis des Bestands an
+    erwerbsnebenkosten = kaufpreis_bestand * ERWERBSNEBENKOSTEN_SATZ
     results['erwerbsnebenkosten'] = erwerbsnebenkosten
-    sanierungskosten_vor_zuschuss = float(params.get('input_sanierungskosten_vor_zuschuss', 0))
     results['sanierungskosten_vor_zuschuss'] = sanierungskosten_vor_zuschuss
-    anzahl_whg = int(params.get('input_anzahl_whg', 1))
-    kosten_bb_pro_we = float(params.get('kosten_baubegleitung_pro_we', KOSTEN_BB_PRO_WE_DEFAULT))
     kosten_baubegleitung_gesamt = anzahl_whg * kosten_bb_pro_we
     results['kosten_baubegleitung_gesamt'] = kosten_baubegleitung_gesamt
     aktivierung_baubegleitung = kosten_baubegleitung_gesamt * KFW_ZUSCHUSS_BB_SATZ
@@ -897,7 +1201,7 @@ def calculate_investment(params, results):
     results['investitionsvolumen'] = gik_brutto
     results['investitionssumme_gesamt'] = gik_brutto
     wert_sanierung = sanierungskosten_vor_zuschuss
-    wert_grundstueck = kaufpreis_bestand * (params.get('input_grundstuecksanteil_pct', 8.0) / 100.0)
+    wert_grundstueck = kaufpreis_bestand * (grundstuecksanteil_pct / 100.0)
     wert_altbau = kaufpreis_bestand - wert_grundstueck
     results['wert_sanierung'] = wert_sanierung
     results['wert_grundstueck'] = wert_grundstueck
@@ -909,27 +1213,30 @@ def calculate_investment(params, results):
     results['afa_basis_altbau'] = afa_basis_altbau
     afa_basis_sanierung_vor_foerderung = wert_sanierung + aktivierung_baubegleitung
     results['afa_basis_sanierung_vor_foerderung'] = afa_basis_sanierung_vor_foerderung
-    kfw_foerderfaehig = float(params.get('input_kfw_foerderfaehige_kosten', 0))
+    kfw_foerderfaehig = kfw_foerderfaehige_kosten
     if kfw_foerderfaehig == 0:
-        kfw_foerderfaehig = float(params.get('input_kfw_darlehen_261_basis', 0))
+        kfw_foerderfaehig = kfw_darlehen_261
     kfw_tilgungszuschuss = kfw_foerderfaehig * KFW_ZUSCHUSS_261_SATZ
     results['kfw_tilgungszuschuss'] = kfw_tilgungszuschuss
     # Kommunale Förderung aufteilen (40% Zuschuss / 60% Eigenanteil)
     komm_zuschuss = kommunale_foerderung  # Legacy: Annahme 40% des Gesamtwerts
     komm_eigenanteil = kommunale_foerderung * 1.5  # 60% entsprechen 150% vom Zuschuss
-    afa_basis_sanierung = max(0, afa_basis_sanierung_vor_foerderung - komm_zuschuss - kfw_tilgungszuschuss + komm_eigenanteil)
+    # Differenz nach Zuschüssen einmal berechnen; sie dient sowohl der AfA-Basis als auch dem Hinweis
+    basis_nach_zuschuessen = afa_basis_sanierung_vor_foerderung - komm_zuschuss - kfw_tilgungszuschuss
+    afa_basis_sanierung = basis_nach_zuschuessen + komm_eigenanteil
+    if afa_basis_sanierung <= 0:
+        afa_basis_sanierung = 0
     results['afa_basis_sanierung'] = afa_basis_sanierung
-    if afa_basis_sanierung_vor_foerderung < (kommunale_foerderung + kfw_tilgungszuschuss) and afa_basis_sanierung_vor_foerderung > 0:
+    if basis_nach_zuschuessen < 0 < afa_basis_sanierung_vor_foerderung:
         results['afa_hinweis'] = "Hinweis: Die Zuschüsse übersteigen die Basis der Sanierungskosten."
     else:
         results['afa_hinweis'] = ""
-    eigenkapital = gik_brutto * params['ek_quote']
+    eigenkapital = gik_brutto * ek_quote
     fremdkapital = gik_brutto - eigenkapital
     results['eigenkapital'] = eigenkapital
     results['fremdkapital_gesamt'] = fremdkapital
     results['eigenkapital_bedarf'] = eigenkapital
     results['fremdkapital_bedarf'] = fremdkapital
-    kfw_darlehen_261 = float(params.get('input_kfw_darlehen_261_basis', 0))
     results['kfw_zuschuss_bb'] = kosten_baubegleitung_gesamt * KFW_ZUSCHUSS_BB_SATZ
     results['kfw_darlehen_basis'] = kfw_darlehen_261
     results['kfw_darlehen'] = kfw_darlehen_261 + kosten_baubegleitung_gesamt
@@ -937,17 +1244,13 @@ def calculate_investment(params, results):
     results['bankdarlehen'] = max(0, fremdkapital - results['kfw_darlehen'])
     results['gesamtzuschuss'] = kfw_tilgungszuschuss + zuschuss_baubegleitung + kommunale_foerderung
     results['effektives_eigenkapital'] = max(0, eigenkapital - results['gesamtzuschuss'])
-    results['kfw_foerderfaehige_kosten_berechnet'] = kfw_darlehen_261 if params.get('input_kfw_foerderfaehige_kosten', 0) == 0 else kfw_foerderfaehig
-    return results
-
+    results['kfw_foerderfaehige_kosten_berechnet'] = kfw_darlehen_261 if kfw_foerderfaehige_kosten == 0 else kfw_foerderfaehig
 
-def calculate_revenues_costs(params, results):
-    # ... (Diese Funktion bleibt unverändert) ...
-    """Berechnet die Startwerte für Mieten und Kosten (Jahr 1)."""
+    # --- Mieten und Kosten (Startwerte Jahr 1) ---
     # 2.1 Mieten
-    miete_wohnen_mtl = float(params['input_wohnflaeche']) * float(params['miete_wohnen'])
-    miete_keller_mtl = float(params['input_kellerflaeche']) * float(params['miete_keller'])
-    miete_stellplatz_mtl = int(params['input_anzahl_stellplaetze']) * float(params['miete_stellplatz'])
+    miete_wohnen_mtl = wohnflaeche_saniert * miete_wohnen
+    miete_keller_mtl = kellerflaeche * miete_keller
+    miete_stellplatz_mtl = anzahl_stellplaetze * miete_stellplatz
 
     jahreskaltmiete = (miete_wohnen_mtl + miete_keller_mtl + miete_stellplatz_mtl) * 12
 
@@ -957,8 +1260,8 @@ def calculate_revenues_costs(params, results):
     results['jahreskaltmiete'] = jahreskaltmiete
 
     # 2.2 Kosten & Abschlag
-    jahresverwaltungskosten = float(params['nk_pro_wohnung']) * int(params['input_anzahl_whg']) * 12
-    sicherheitsabschlag_absolut = jahreskaltmiete * params['sicherheitsabschlag']
+    jahresverwaltungskosten = nk_pro_wohnung * anzahl_whg * 12
+    sicherheitsabschlag_absolut = jahreskaltmiete * sicherheitsabschlag
 
     results['jahresverwaltungskosten'] = jahresverwaltungskosten
     results['sicherheitsabschlag_absolut'] = sicherheitsabschlag_absolut
@@ -974,6 +1277,7 @@ def calculate_revenues_costs(params, results):
 
     return results
 
+
 # ====================================================================================
 # DETAILLIERTE PROJEKTIONSRECHNUNG (Finanzierung, Steuern, Cashflow)
 # ====================================================================================
@@ -984,230 +1288,225 @@ def calculate_projection(params, results):
 
     if results['investitionssumme_gesamt'] == 0:
         results['projection_df'] = pd.DataFrame()
+        results['projection_array'] = np.empty((0, len(PROJECTION_COLUMNS)))
         return results
 
-    jahre = range(1, BERECHNUNGSZEITRAUM + 1)
-    df = pd.DataFrame(index=jahre)
-    df.index.name = 'Jahr'
-
-    # 1. Einnahmen, Kosten und Wertentwicklung
+    # Eingangsgrößen einmalig aus params/results in lokale Variablen lesen
+    n_jahre = BERECHNUNGSZEITRAUM
     mietsteigerung = params['mietsteigerung_pa']
     kostensteigerung = params['kostensteigerung_pa']
     wertsteigerung = params['wertsteigerung_pa']
+    jahreskaltmiete_netto = results['jahreskaltmiete_netto']
+    jahresverwaltungskosten = results['jahresverwaltungskosten']
+    gik_brutto = results['gik_brutto']
+    steuersatz = results['grenzsteuersatz_brutto']
+    kommunale_foerderung = results.get('kommunale_foerderung', 0)
 
-    miet_faktoren = (1 + mietsteigerung) ** np.arange(BERECHNUNGSZEITRAUM)
-    kosten_faktoren = (1 + kostensteigerung) ** np.arange(BERECHNUNGSZEITRAUM)
-    wert_faktoren = (1 + wertsteigerung) ** np.arange(1, BERECHNUNGSZEITRAUM + 1)
-
-    df['Mieteinnahmen (Netto)'] = results['jahreskaltmiete_netto'] * miet_faktoren
-    df['Betriebskosten'] = results['jahresverwaltungskosten'] * kosten_faktoren
-    df['Einnahmenüberschuss'] = df['Mieteinnahmen (Netto)'] - df['Betriebskosten']
+    # Alle Spalten werden in ein einziges float64-Array geschrieben und erst am Ende als DataFrame verpackt
+    proj = np.zeros((n_jahre, len(PROJECTION_COLUMNS)), dtype=np.float64)
 
+    # 1. Einnahmen, Kosten und Wertentwicklung
+    # Miete, Kosten und Immobilienwert gemeinsam: eine cumprod über alle drei Raten und
+    # eine Multiplikation mit den Startwerten (der Immobilienwert beginnt bereits mit einem Jahr Steigerung)
+    entwicklung = growth_factors((mietsteigerung, kostensteigerung, wertsteigerung), n_jahre, start=WACHSTUM_STARTJAHRE)
     # Immobilienwert basiert auf GIK Brutto (ohne Baubegleitungskosten)
-    df['Immobilienwert'] = results['gik_brutto'] * wert_faktoren
+    startwerte = (jahreskaltmiete_netto, jahresverwaltungskosten, gik_brutto)
+    np.multiply(entwicklung, startwerte, out=entwicklung)
+    proj[:, WACHSTUM_SPALTEN] = entwicklung
+
+    # Ergebnisse werden per out= direkt in die Spalten des Arrays geschrieben (keine temporären Arrays)
+    np.subtract(proj[:, COL_MIETEINNAHMEN], proj[:, COL_BETRIEBSKOSTEN], out=proj[:, COL_UEBERSCHUSS])
 
     # 2. Finanzierung (NEU: Inkl. Endfälliges Darlehen und korrektes Zuschuss-Timing)
-    df = calculate_financing_schedule(df, params, results)
+    proj = calculate_financing_schedule(proj, params, results)
 
     # 3. Abschreibung (AfA)
-    df = calculate_depreciation_schedule(df, results)
+    proj = calculate_depreciation_schedule(proj, results)
 
     # 4. Steuerberechnung
-    df['Steuerliches Ergebnis (V+V)'] = (
-        df['Einnahmenüberschuss']
-        - df['Zinsen Gesamt']
-        - df['AfA Gesamt']
-    )
+    np.subtract(proj[:, COL_UEBERSCHUSS], proj[:, COL_ZINSEN_GESAMT], out=proj[:, COL_STEUERLICHES_ERGEBNIS])
+    np.subtract(proj[:, COL_STEUERLICHES_ERGEBNIS], proj[:, COL_AFA_GESAMT], out=proj[:, COL_STEUERLICHES_ERGEBNIS])
 
-    steuersatz = results['grenzsteuersatz_brutto']
-    df['Steuerersparnis'] = -df['Steuerliches Ergebnis (V+V)'] * steuersatz
+    np.multiply(proj[:, COL_STEUERLICHES_ERGEBNIS], -steuersatz, out=proj[:, COL_STEUERERSPARNIS])
 
     # 5. Cashflow-Synthese
     # Annuität Gesamt beinhaltet hier den gesamten Kapitaldienst (Zins + Tilgung, auch die endfällige Tilgung)
-    df['Cashflow vor Steuer'] = df['Einnahmenüberschuss'] - df['Annuität Gesamt']
+    np.subtract(proj[:, COL_UEBERSCHUSS], proj[:, COL_ANNUITAET_GESAMT], out=proj[:, COL_CASHFLOW_VOR_STEUER])
 
     # Sonderzufluss (Kommunale Förderung) in Jahr 1
-    df['Sonderzufluss'] = 0.0
-    kommunale_foerderung = results.get('kommunale_foerderung', 0)
-    if kommunale_foerderung > 0 and 1 in df.index:
-        df.loc[1, 'Sonderzufluss'] = kommunale_foerderung
+    if kommunale_foerderung > 0:
+        proj[0, COL_SONDERZUFLUSS] = kommunale_foerderung
 
-    df['Cashflow nach Steuer'] = df['Cashflow vor Steuer'] + df['Steuerersparnis'] + df['Sonderzufluss']
+    np.add(proj[:, COL_CASHFLOW_VOR_STEUER], proj[:, COL_STEUERERSPARNIS], out=proj[:, COL_CASHFLOW_NACH_STEUER])
+    np.add(proj[:, COL_CASHFLOW_NACH_STEUER], proj[:, COL_SONDERZUFLUSS], out=proj[:, COL_CASHFLOW_NACH_STEUER])
 
     # 6. Nettovermögen
-    df['Nettovermögen'] = df['Immobilienwert'] - df['Restschuld Gesamt']
+    np.subtract(proj[:, COL_IMMOBILIENWERT], proj[:, COL_RESTSCHULD_GESAMT], out=proj[:, COL_NETTOVERMOEGEN])
 
+    # copy=False: Der DataFrame nutzt das Array als einzigen float64-Block, ohne Kopie
+    df = pd.DataFrame(proj, index=pd.RangeIndex(1, n_jahre + 1, name='Jahr'), columns=PROJECTION_COLUMNS, copy=False)
     results['projection_df'] = df
+    # Rohes Array für die KPI-Berechnung (positionaler Zugriff über die COL_* Indizes)
+    results['projection_array'] = proj
     return results
 
 
 # NEU (Punkt 3): Angepasste Funktion für Finanzierungspläne (KfW Zuschuss Timing)
-def calculate_financing_schedule(df, params, results):
-    """Berechnet die Tilgungspläne für Bank- und KfW-Darlehen (inkl. Endfällig)."""
-    
+def calculate_financing_schedule(proj, params, results):
+    """Berechnet die Tilgungspläne für Bank- und KfW-Darlehen (inkl. Endfällig) direkt in das Projektions-Array."""
+    n_jahre = proj.shape[0]
+
     # --- Bankdarlehen (Standard Annuität) ---
-    # ... (Bankdarlehen Logik bleibt unverändert) ...
     darlehen_bank = results['bankdarlehen']
     zins_bank = params['bank_zins']
     tilgung_bank = params['bank_tilgung']
 
+    # Ohne Darlehen bleiben die (mit 0 initialisierten) Spalten unverändert
     if darlehen_bank > 0 and (zins_bank + tilgung_bank) > 0:
-        annuitaet_bank = darlehen_bank * (zins_bank + tilgung_bank)
-        
-        restschuld = darlehen_bank
-        zinsen_liste, tilgung_liste, restschuld_liste = [], [], []
-
-        for jahr in df.index:
-            if restschuld <= 0.01:
-                zinsen_liste.append(0); tilgung_liste.append(0); restschuld_liste.append(0)
-                continue
-
-            zins_betrag = restschuld * zins_bank
-            tilgung_betrag = annuitaet_bank - zins_betrag
-            
-            if tilgung_betrag > restschuld:
-                tilgung_betrag = restschuld
-            
-            restschuld -= tilgung_betrag
-            
-            zinsen_liste.append(zins_betrag)
-            tilgung_liste.append(tilgung_betrag)
-            restschuld_liste.append(restschuld)
-
-        df['Zins Bank'] = zinsen_liste
-        df['Tilgung Bank'] = tilgung_liste
-        df['Restschuld Bank'] = restschuld_liste
-    else:
-        df['Zins Bank'] = 0; df['Tilgung Bank'] = 0; df['Restschuld Bank'] = 0
+        (proj[:, COL_ZINS_BANK], proj[:, COL_TILGUNG_BANK], proj[:, COL_RESTSCHULD_BANK]) = bank_annuity_schedule(
+            darlehen_bank, zins_bank, tilgung_bank, n_jahre)
 
     # --- KfW-Darlehen (NEU: Annuität oder Endfällig, Zuschuss nach 12 Monaten) ---
     darlehen_kfw = results['kfw_darlehen']
     zins_kfw = params['kfw_zins']
     laufzeit_kfw = params['kfw_gesamtlaufzeit']
     darlehenstyp_kfw = params.get('kfw_darlehenstyp', KFW_ANNUITAET)
-    tilgungsfrei_kfw = params['kfw_tilgungsfreie_jahre'] if darlehenstyp_kfw == KFW_ANNUITAET else 0
-
 
     # Gesamter KfW Zuschuss (Tilgung + BB)
     zuschuss_kfw_gesamt = results['kfw_tilgungszuschuss'] + results['zuschuss_baubegleitung']
 
     if darlehen_kfw > 0:
-        restschuld = darlehen_kfw
-        zinsen_liste, tilgung_liste, restschuld_liste = [], [], []
-        annuitaet_kfw = 0
-
-        for jahr in df.index:
-            # Exit-Bedingung, wenn Darlehen getilgt ist (nach Jahr 1)
-            if restschuld <= 0.01 and jahr > 1:
-                   zinsen_liste.append(0); tilgung_liste.append(0); restschuld_liste.append(0)
-                   continue
-
-            # --- 1. Zinsberechnung (auf Restschuld zu Beginn des Jahres) ---
-            zins_betrag = restschuld * zins_kfw
-            tilgung_betrag = 0
-
-            # --- 2. Annuitätenberechnung / Neuberechnung (Nur bei Annuitätendarlehen) ---
-
-            if darlehenstyp_kfw == KFW_ANNUITAET:
-                # Berechnung der Annuität, wenn die Tilgungsphase beginnt.
-                if jahr == tilgungsfrei_kfw + 1:
-                     # Wenn Tf >= 2, wird die Annuität erst hier berechnet (auf die reduzierte Schuld).
-                     # Wenn Tf < 2 (also 0 oder 1), UND es ist Jahr 1, muss die initiale Annuität berechnet werden (vor Zuschuss).
-                     # Wenn Tf < 2 und Jahr > 1, wurde die Annuität bereits in Jahr 1 neu berechnet.
-                     
-                     # Fall 1: Tf >= 2 ODER (Tf < 2 UND Jahr 1)
-                     if tilgungsfrei_kfw >= 2 or (tilgungsfrei_kfw < 2 and jahr == 1):
-                         restlaufzeit = laufzeit_kfw - tilgungsfrei_kfw
-                         if restlaufzeit > 0:
-                            annuitaet_kfw = calculate_annuity(restschuld, zins_kfw, restlaufzeit)
-
-                # Tilgungsbetrag ermitteln
-                if jahr > tilgungsfrei_kfw:
-                    tilgung_betrag = annuitaet_kfw - zins_betrag
-
-            # --- 3. Tilgungslogik (Typ-abhängig) ---
-            elif darlehenstyp_kfw == KFW_ENDFAELLIG:
-                if jahr == laufzeit_kfw:
-                    # Endfällige Tilgung
-                    tilgung_betrag = restschuld
-                elif jahr > laufzeit_kfw:
-                     zins_betrag = 0 # Keine Zinsen nach Fälligkeit
-
-            # Begrenzung der Tilgung
-            if tilgung_betrag > restschuld:
-                tilgung_betrag = restschuld
-
-            # --- 4. Update Restschuld (Reguläre Tilgung) ---
-            restschuld -= tilgung_betrag
-
-            # --- 5. Zuschussanwendung (Immer am Ende von Jahr 1) und Neuberechnung Annuität ---
-            if jahr == 1:
-                restschuld = max(0, restschuld - zuschuss_kfw_gesamt)
-
-                # NEU BERECHNEN der Annuität für die Restlaufzeit (ab Jahr 2), FALLS notwendig
-                # Notwendig, wenn die Tilgungsphase in Jahr 2 läuft (d.h. Tf=0 oder Tf=1)
-                if darlehenstyp_kfw == KFW_ANNUITAET and tilgungsfrei_kfw < 2:
-                    restlaufzeit_ab_j2 = laufzeit_kfw - 1
-                    if restlaufzeit_ab_j2 > 0 and restschuld > 0:
-                        # Berechne die Annuität neu auf Basis der reduzierten Schuld und Restlaufzeit
-                        annuitaet_kfw = calculate_annuity(restschuld, zins_kfw, restlaufzeit_ab_j2)
-                    elif restlaufzeit_ab_j2 <= 0:
-                        annuitaet_kfw = 0
-
-            # Speichern der Werte für das Jahr
-            zinsen_liste.append(zins_betrag)
-            tilgung_liste.append(tilgung_betrag)
-            restschuld_liste.append(restschuld)
-
-        # Zuweisung der Listen zum DataFrame
-        df['Zins KfW'] = zinsen_liste
-        df['Tilgung KfW'] = tilgung_liste
-        df['Restschuld KfW'] = restschuld_liste
-
-    else:
-        df['Zins KfW'] = 0; df['Tilgung KfW'] = 0; df['Restschuld KfW'] = 0
+        if darlehenstyp_kfw == KFW_ANNUITAET:
+            kfw_plan = kfw_annuity_schedule(darlehen_kfw, zins_kfw, laufzeit_kfw, params['kfw_tilgungsfreie_jahre'],
+                                            zuschuss_kfw_gesamt, n_jahre)
+        else:
+            kfw_plan = kfw_endfaellig_schedule(darlehen_kfw, zins_kfw, laufzeit_kfw, zuschuss_kfw_gesamt, n_jahre)
+        (proj[:, COL_ZINS_KFW], proj[:, COL_TILGUNG_KFW], proj[:, COL_RESTSCHULD_KFW]) = kfw_plan
 
     # Gesamtsummen
-    df['Zinsen Gesamt'] = df['Zins Bank'] + df['Zins KfW']
-    df['Tilgung Gesamt'] = df['Tilgung Bank'] + df['Tilgung KfW']
+    np.add(proj[:, COL_ZINS_BANK], proj[:, COL_ZINS_KFW], out=proj[:, COL_ZINSEN_GESAMT])
+    np.add(proj[:, COL_TILGUNG_BANK], proj[:, COL_TILGUNG_KFW], out=proj[:, COL_TILGUNG_GESAMT])
     # Annuität Gesamt = Gesamte Kapitaldienstleistung (Zins + Tilgung)
-    df['Annuität Gesamt'] = df['Zinsen Gesamt'] + df['Tilgung Gesamt']
-    df['Restschuld Gesamt'] = df['Restschuld Bank'] + df['Restschuld KfW']
+    np.add(proj[:, COL_ZINSEN_GESAMT], proj[:, COL_TILGUNG_GESAMT], out=proj[:, COL_ANNUITAET_GESAMT])
+    np.add(proj[:, COL_RESTSCHULD_BANK], proj[:, COL_RESTSCHULD_KFW], out=proj[:, COL_RESTSCHULD_GESAMT])
+
+    return proj
 
-    return df
 
-def calculate_depreciation_schedule(df, results):
+# Die Tilgungspläne sind reine Funktionen auf Skalaren und liefern (Zinsen, Tilgung, Restschuld) als float64-Arrays
+# der Länge n_jahre (Index 0 = Jahr 1).
+
+def annuity_phase_schedule(darlehen, zins, annuitaet, n_jahre):
+    """(Zinsen, Tilgung, Restschuld) einer Tilgungsphase mit konstanter Annuität ab dem Startsaldo darlehen."""
+    # Restschuld zu Beginn jedes Jahres: B_t = B_0*(1+i)^t - A*((1+i)^t - 1)/i (bzw. B_0 - A*t bei i = 0)
+    t = np.arange(n_jahre, dtype=np.float64)
+    if zins == 0:
+        restschuld_anfang = darlehen - annuitaet * t
+    else:
+        faktor = (1.0 + zins) ** t
+        restschuld_anfang = darlehen * faktor - annuitaet * (faktor - 1.0) / zins
+
+    zinsen_arr = restschuld_anfang * zins
+    tilgung_arr = annuitaet - zinsen_arr
+    # Letzte Rate: Tilgung auf die Restschuld begrenzen
+    np.minimum(tilgung_arr, restschuld_anfang, out=tilgung_arr)
+    restschuld_arr = restschuld_anfang - tilgung_arr
+
+    # Nach vollständiger Tilgung (Restschuld <= 0.01 zu Jahresbeginn) bleiben alle Werte 0
+    getilgt = restschuld_anfang <= 0.01
+    for arr in (zinsen_arr, tilgung_arr, restschuld_arr):
+        arr[getilgt] = 0.0
+
+    return zinsen_arr, tilgung_arr, restschuld_arr
+
+def bank_annuity_schedule(darlehen, zins, tilgung, n_jahre):
+    """Tilgungsplan eines Annuitätendarlehens mit anfänglicher Tilgung (Bankdarlehen), geschlossen berechnet."""
+    annuitaet = darlehen * (zins + tilgung)
+    return annuity_phase_schedule(darlehen, zins, annuitaet, n_jahre)
+
+
+def kfw_annuity_schedule(darlehen, zins, laufzeit, tilgungsfrei, zuschuss, n_jahre):
+    """Tilgungsplan des KfW-Annuitätendarlehens (tilgungsfreie Jahre, Zuschuss am Ende von Jahr 1), geschlossen berechnet."""
+    zinsen_arr, tilgung_arr, restschuld_arr = np.zeros(n_jahre), np.zeros(n_jahre), np.zeros(n_jahre)
+
+    # Jahr 1: Zinsen auf das volle Darlehen; ohne tilgungsfreie Jahre Tilgung aus der Annuität über die Gesamtlaufzeit
+    zinsen_arr[0] = darlehen * zins
+    if tilgungsfrei == 0:
+        tilgung_arr[0] = min(calculate_annuity(darlehen, zins, laufzeit) - zinsen_arr[0], darlehen)
+    # Zuschussanwendung (Immer am Ende von Jahr 1)
+    restschuld = max(0, darlehen - tilgung_arr[0] - zuschuss)
+    restschuld_arr[0] = restschuld
+
+    # Exit-Bedingung, wenn Darlehen getilgt ist (nach Jahr 1)
+    if restschuld <= 0.01:
+        return zinsen_arr, tilgung_arr, restschuld_arr
+
+    # Beginn der Tilgungsphase und Restlaufzeit der (neu berechneten) Annuität auf die Schuld nach Zuschuss:
+    # Bei Tf < 2 ab Jahr 2 über Laufzeit - 1, sonst ab Jahr Tf + 1 über Laufzeit - Tf
+    if tilgungsfrei < 2:
+        start_jahr, restlaufzeit = 2, laufzeit - 1
+    else:
+        start_jahr, restlaufzeit = tilgungsfrei + 1, laufzeit - tilgungsfrei
+
+    # Tilgungsfreie Jahre ab Jahr 2: nur Zinsen, Restschuld konstant
+    tilgungsfrei_bis = min(start_jahr, n_jahre + 1) - 1
+    zinsen_arr[1:tilgungsfrei_bis] = restschuld * zins
+    restschuld_arr[1:tilgungsfrei_bis] = restschuld
+
+    # Tilgungsphase mit konstanter Annuität (geschlossen wie beim Bankdarlehen)
+    if start_jahr <= n_jahre:
+        annuitaet = calculate_annuity(restschuld, zins, restlaufzeit)
+        (zinsen_arr[start_jahr - 1:], tilgung_arr[start_jahr - 1:], restschuld_arr[start_jahr - 1:]) = annuity_phase_schedule(
+            restschuld, zins, annuitaet, n_jahre - start_jahr + 1)
+
+    return zinsen_arr, tilgung_arr, restschuld_arr
+
+
+def kfw_endfaellig_schedule(darlehen, zins, laufzeit, zuschuss, n_jahre):
+    """Tilgungsplan des endfälligen KfW-Darlehens (Zuschuss am Ende von Jahr 1, Tilgung bei Fälligkeit)."""
+    jahre = np.arange(1, n_jahre + 1)
+    zinsen_arr, tilgung_arr, restschuld_arr = np.zeros(n_jahre), np.zeros(n_jahre), np.zeros(n_jahre)
+
+    # Jahr 1: Zinsen auf das volle Darlehen; Zuschussanwendung am Ende von Jahr 1
+    tilgung_j1 = darlehen if laufzeit == 1 else 0
+    zinsen_arr[0] = darlehen * zins if laufzeit >= 1 else 0 # Keine Zinsen nach Fälligkeit
+    tilgung_arr[0] = tilgung_j1
+    restschuld = max(0, darlehen - tilgung_j1 - zuschuss)
+    restschuld_arr[0] = restschuld
+
+    # Ab Jahr 2 (nur solange eine Restschuld besteht) ist die Restschuld bis zur Fälligkeit konstant:
+    # Zinsen bis einschließlich Fälligkeitsjahr, endfällige Tilgung im Fälligkeitsjahr, danach 0.
+    if restschuld > 0.01:
+        folgejahre = jahre >= 2
+        zinsen_arr[folgejahre & (jahre <= laufzeit)] = restschuld * zins
+        tilgung_arr[folgejahre & (jahre == laufzeit)] = restschuld
+        # Ohne gültige Fälligkeit (Laufzeit < 1) bleibt die Restschuld dauerhaft bestehen
+        restschuld_arr[folgejahre & ((jahre < laufzeit) | (laufzeit < 1))] = restschuld
+
+    return zinsen_arr, tilgung_arr, restschuld_arr
+
+def calculate_depreciation_schedule(proj, results):
     """Berechnet die jährlichen AfA-Beträge (Denkmal und Linear)."""
-    
-    basis_sanierung = results['afa_basis_sanierung']
-    basis_altbau = results['afa_basis_altbau']
-
-    # 1. Denkmal-AfA (Sonder-AfA)
-    afa_denkmal_liste = []
-    for jahr in df.index:
-        if 1 <= jahr <= 8:
-            afa_betrag = basis_sanierung * AFA_DENKMAL_J1_8
-        elif 9 <= jahr <= 12:
-            afa_betrag = basis_sanierung * AFA_DENKMAL_J9_12
-        else:
-            afa_betrag = 0
-        afa_denkmal_liste.append(afa_betrag)
-    
-    # 2. Lineare AfA (Altbau)
-    afa_linear_liste = []
-    restwert_altbau = basis_altbau
-    for jahr in df.index:
-        afa_betrag = basis_altbau * AFA_ALTBAU_SATZ
-        if afa_betrag > restwert_altbau:
-            afa_betrag = restwert_altbau
-        
-        restwert_altbau -= afa_betrag
-        afa_linear_liste.append(afa_betrag)
+    (proj[:, COL_AFA_DENKMAL], proj[:, COL_AFA_ALTBAU]) = depreciation_schedule(
+        results['afa_basis_sanierung'], results['afa_basis_altbau'], proj.shape[0])
+    np.add(proj[:, COL_AFA_DENKMAL], proj[:, COL_AFA_ALTBAU], out=proj[:, COL_AFA_GESAMT])
+    return proj
 
-    df['AfA Denkmal (Sonder)'] = afa_denkmal_liste
-    df['AfA Altbau (Linear)'] = afa_linear_liste
-    df['AfA Gesamt'] = df['AfA Denkmal (Sonder)'] + df['AfA Altbau (Linear)']
-    return df
+
+def depreciation_schedule(basis_sanierung, basis_altbau, n_jahre):
+    """AfA-Plan als (Denkmal-AfA, lineare AfA Altbau) float64-Arrays der Länge n_jahre (Index 0 = Jahr 1)."""
+    jahre = np.arange(1, n_jahre + 1)
+
+    # 1. Denkmal-AfA (Sonder-AfA): J1-8 und J9-12, danach 0
+    afa_denkmal_arr = np.where(jahre <= 8, basis_sanierung * AFA_DENKMAL_J1_8,
+                               np.where(jahre <= 12, basis_sanierung * AFA_DENKMAL_J9_12, 0.0))
+
+    # 2. Lineare AfA (Altbau): fester Jahresbetrag, begrenzt auf den Restwert zu Jahresbeginn
+    afa_betrag = basis_altbau * AFA_ALTBAU_SATZ
+    restwert_altbau = np.maximum(basis_altbau - afa_betrag * (jahre - 1), 0.0)
+    afa_linear_arr = np.minimum(afa_betrag, restwert_altbau)
+
+    return afa_denkmal_arr, afa_linear_arr
 
 
 # Funktion für alle KPIs
@@ -1219,18 +1518,16 @@ def calculate_kpis(params, results):
     gesamtzuschuss = results.get('gesamtzuschuss', 0)
     jahreskaltmiete_netto = results.get('jahreskaltmiete_netto', 0)
     einnahmen_ueberschuss_j1 = results.get('einnahmen_ueberschuss_vor_finanz_steuer', 0)
-    wohnflaeche = float(params.get('input_wohnflaeche', 0))
+    wohnflaeche = params.get('input_wohnflaeche', 0.0)
     eigenkapital_bedarf = results.get('eigenkapital_bedarf', 0)
     
-    try:
-        haltedauer = int(params['geplanter_verkauf'])
-    except (ValueError, TypeError):
-        haltedauer = 10
+    # Bereits in convert_inputs_to_params normalisiert (ungültige Eingaben ergeben den Default von 10 Jahren)
+    haltedauer = params['geplanter_verkauf']
 
     if haltedauer > BERECHNUNGSZEITRAUM:
         haltedauer = BERECHNUNGSZEITRAUM
 
-    df = results.get('projection_df')
+    proj = results.get('projection_array')
 
     # --- Renditekennzahlen (Jahr 1) ---
 
@@ -1252,36 +1549,37 @@ def calculate_kpis(params, results):
         # Brutto
         results['kpi_kaufpreis_qm_brutto'] = gik_brutto / wohnflaeche
         # Netto (nach allen Zuschüssen)
-        results['kpi_kaufpreis_qm_netto'] = (investitionssumme_gesamt - gesamtzuschuss) / wohnflaeche
+        kaufpreis_qm_netto = (investitionssumme_gesamt - gesamtzuschuss) / wohnflaeche
     else:
         results['kpi_kaufpreis_qm_brutto'] = 0
-        results['kpi_kaufpreis_qm_netto'] = 0
+        kaufpreis_qm_netto = 0
+    results['kpi_kaufpreis_qm_netto'] = kaufpreis_qm_netto
 
     # --- Erweiterte KPIs (Haltedauer-basiert) ---
 
-    if df is None or df.empty:
+    if proj is None or proj.size == 0:
         results['kpi_irr_nach_steuer'] = 0.0
         results['kpi_steuerfreier_gewinn'] = 0.0
-        results['kpi_kaufpreis_qm_effektiv'] = results.get('kpi_kaufpreis_qm_netto', 0)
+        results['kpi_kaufpreis_qm_effektiv'] = kaufpreis_qm_netto
         results['kpi_gesamtrendite_nach_steuer'] = 0.0
         return results
 
-    # 1. Exit-Erlös
-    # Nutzt .iloc[-1] als Fallback, falls haltedauer außerhalb des Index liegt (sollte durch obigen Check verhindert sein)
-    if haltedauer in df.index:
-        exit_erloes = df.loc[haltedauer, 'Nettovermögen']
+    # 1. Exit-Erlös (Zeile haltedauer-1 entspricht Jahr haltedauer)
+    # Nutzt die letzte Zeile als Fallback, falls haltedauer außerhalb des Zeitraums liegt (sollte durch obigen Check verhindert sein)
+    if 1 <= haltedauer <= proj.shape[0]:
+        exit_erloes = proj[haltedauer - 1, COL_NETTOVERMOEGEN]
     else:
-        exit_erloes = df['Nettovermögen'].iloc[-1] if not df.empty else 0
+        exit_erloes = proj[-1, COL_NETTOVERMOEGEN]
 
 
     # 2. Kumulierte Cashflows und Steuern
-    cum_cashflow_nach_steuer = df['Cashflow nach Steuer'].head(haltedauer).sum()
-    cum_steuerersparnis = df['Steuerersparnis'].head(haltedauer).sum()
+    cum_cashflow_nach_steuer = proj[:haltedauer, COL_CASHFLOW_NACH_STEUER].sum()
+    cum_steuerersparnis = proj[:haltedauer, COL_STEUERERSPARNIS].sum()
 
     # 3. Kaufpreis/m² (Effektiv)
     if wohnflaeche > 0:
         steuerersparnis_pro_qm = cum_steuerersparnis / wohnflaeche
-        results['kpi_kaufpreis_qm_effektiv'] = results['kpi_kaufpreis_qm_netto'] - steuerersparnis_pro_qm
+        results['kpi_kaufpreis_qm_effektiv'] = kaufpreis_qm_netto - steuerersparnis_pro_qm
     else:
         results['kpi_kaufpreis_qm_effektiv'] = 0
 
@@ -1296,35 +1594,65 @@ def calculate_kpis(params, results):
         results['kpi_gesamtrendite_nach_steuer'] = float('inf') if total_profit > 0 else 0
 
     # 6. IRR Berechnung
-    results = calculate_irr(results, eigenkapital_bedarf, df, haltedauer, exit_erloes)
+    results = calculate_irr(results, eigenkapital_bedarf, proj, haltedauer, exit_erloes)
 
     return results
 
 
-def calculate_irr(results, initial_investment, df, haltedauer, exit_erloes):
+def irr_newton(cashflows, guess=0.1, tol=1e-12, max_iter=100):
+    """Newton-Verfahren auf dem Kapitalwert einer Cashflow-Reihe (ndarray). Gibt NaN zurück, falls keine Konvergenz."""
+    perioden = np.arange(cashflows.shape[0], dtype=np.float64)
+    rate = guess
+    for _ in range(max_iter):
+        if rate <= -1.0:
+            return np.nan
+        diskont = (1.0 + rate) ** -perioden
+        npv = np.dot(cashflows, diskont)
+        ableitung = -np.dot(cashflows * perioden, diskont) / (1.0 + rate)
+        if ableitung == 0.0 or not np.isfinite(ableitung):
+            return np.nan
+        schritt = npv / ableitung
+        rate -= schritt
+        if abs(schritt) < tol:
+            return rate
+    return np.nan
+
+
+def solve_irr(irr_stream):
+    """IRR einer Cashflow-Reihe (ndarray); NaN, falls weder Newton noch numpy_financial eine Lösung finden."""
+    # Newton nur bei genau einem Vorzeichenwechsel (dann ist die IRR eindeutig). Bei mehreren Wechseln
+    # (z.B. Endfälliges Darlehen, 0% EK) wählt npf.irr wie bisher die Lösung, die am nächsten an 0 liegt.
+    vorzeichen = np.sign(irr_stream[irr_stream != 0.0])
+    if np.count_nonzero(vorzeichen[1:] != vorzeichen[:-1]) != 1 and ensure_numpy_financial():
+        return npf.irr(irr_stream)
+    irr = irr_newton(irr_stream)
+    # Fallback auf die Polynom-Nullstellen von numpy_financial, falls Newton nicht konvergiert
+    if np.isnan(irr) and ensure_numpy_financial():
+        irr = npf.irr(irr_stream)
+    return irr
+
+
+def calculate_irr(results, initial_investment, proj, haltedauer, exit_erloes):
     """Berechnet den Internal Rate of Return (IRR) nach Steuern."""
-    if not IRR_ENABLED:
-        results['kpi_irr_nach_steuer'] = "N/A"
-        return results
-        
-    # Cashflows während der Haltedauer (inkl. Sonderzufluss Jahr 1)
-    cashflows = df['Cashflow nach Steuer'].head(haltedauer).tolist()
+    # Gesamte Cashflow-Reihe für IRR als ndarray (inkl. Sonderzufluss Jahr 1)
+    cashflows = proj[:haltedauer, COL_CASHFLOW_NACH_STEUER]
+    irr_stream = np.empty(cashflows.shape[0] + 1)
+    irr_stream[0] = -initial_investment
+    irr_stream[1:] = cashflows
 
-    # Gesamte Cashflow-Reihe für IRR
-    irr_stream = [-initial_investment] + cashflows
-    
     # Füge den Exit-Erlös zum letzten Jahr hinzu
     if len(irr_stream) > 1:
         irr_stream[-1] += exit_erloes
-    
+
     try:
-        irr = npf.irr(irr_stream)
-        if pd.isna(irr) or not np.isreal(irr):
+        irr = solve_irr(irr_stream)
+        # Skalare Prüfung direkt auf dem Float (keine Dispatch-Kosten von pd.isna/np.isreal)
+        if isinstance(irr, complex) or math.isnan(irr):
             results['kpi_irr_nach_steuer'] = 0.0
         else:
             results['kpi_irr_nach_steuer'] = float(irr)
     except Exception as e:
-        logging.error(f"IRR calculation failed: {e}")
+        logger.error("IRR calculation failed: %s", e)
         results['kpi_irr_nach_steuer'] = "Fehler"
 
     return results
@@ -1336,9 +1664,7 @@ def calculate_irr(results, initial_investment, df, haltedauer, exit_erloes):
 def add_footer(canvas, doc):
     """Fügt den Disclaimer als Fußzeile auf jeder Seite hinzu."""
     canvas.saveState()
-    styles = getSampleStyleSheet()
-    footer_style = ParagraphStyle(name='FooterStyle', parent=styles['Normal'], fontSize=8, leading=10, textColor=colors.grey, alignment=0)
-    footer = Paragraph(PDF_DISCLAIMER_TEXT, footer_style)
+    footer = Paragraph(PDF_DISCLAIMER_TEXT, PDF_STYLES['FooterStyle'])
     w, h = footer.wrapOn(canvas, doc.width, doc.bottomMargin)
     footer.drawOn(canvas, doc.leftMargin, 1*cm)
     canvas.restoreState()
@@ -1346,7 +1672,7 @@ def add_footer(canvas, doc):
 
 def create_pdf_report(results, params):
     """Generiert einen PDF-Bericht der Analyse."""
-    if not PDF_EXPORT_ENABLED:
+    if not ensure_reportlab():
         return None
 
     buffer = BytesIO()
@@ -1355,11 +1681,7 @@ def create_pdf_report(results, params):
                             rightMargin=1.5*cm, leftMargin=1.5*cm,
                             topMargin=2*cm, bottomMargin=2.5*cm)
     
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(name='TitleStyle', fontSize=18, leading=22, spaceAfter=12, fontName='Helvetica-Bold', textColor=RL_COLOR_PRIMARY))
-    styles.add(ParagraphStyle(name='HeaderStyle', fontSize=14, leading=18, spaceAfter=10, fontName='Helvetica-Bold', textColor=RL_COLOR_PRIMARY))
-    styles.add(ParagraphStyle(name='NormalStyle', fontSize=10, leading=14))
-    styles.add(ParagraphStyle(name='SmallStyle', fontSize=8, leading=12))
+    styles = PDF_STYLES
 
     story = []
     haltedauer = params.get('geplanter_verkauf', 10)
@@ -1396,15 +1718,7 @@ def create_pdf_report(results, params):
     ]
     
     t = Table(kpi_data, colWidths=[6*cm]*4)
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), RL_COLOR_PRIMARY),
-        ('TEXTCOLOR',(0,0),(-1,0),colors.white),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0,0), (-1,0), 12),
-        ('BACKGROUND', (0,1), (-1,-1), RL_COLOR_LIGHT_BG),
-        ('GRID', (0,0), (-1,-1), 1, colors.grey)
-    ]))
+    t.setStyle(PDF_TABLE_STYLE_KPI)
     story.append(t)
     story.append(Spacer(1, 0.5*cm))
 
@@ -1425,15 +1739,7 @@ def create_pdf_report(results, params):
     ]
 
     t_kpi_detail = Table(kpi_detail_data, colWidths=[6*cm, 5*cm, 6*cm, 5*cm])
-    t_kpi_detail.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), RL_COLOR_PRIMARY),
-        ('TEXTCOLOR',(0,0),(-1,0),colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('ALIGN', (1,1), (1,-1), 'RIGHT'),
-        ('ALIGN', (3,1), (3,-1), 'RIGHT'),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-        ('SPAN', (2,3), (3,3)),
-    ]))
+    t_kpi_detail.setStyle(PDF_TABLE_STYLE_KPI_DETAIL)
     story.append(t_kpi_detail)
     story.append(Spacer(1, 0.8*cm))
 
@@ -1459,16 +1765,7 @@ def create_pdf_report(results, params):
     ]
 
     t_inv = Table(inv_data, colWidths=[8*cm, 5*cm])
-    t_inv.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), RL_COLOR_PRIMARY),
-        ('TEXTCOLOR',(0,0),(-1,0),colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTNAME', (0,4), (-1,4), 'Helvetica-Bold'),
-        ('FONTNAME', (0,6), (-1,6), 'Helvetica-Bold'),
-        ('ALIGN', (1,0), (1,-1), 'RIGHT'),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-        ('SPAN', (0,6), (1,6)),
-    ]))
+    t_inv.setStyle(PDF_TABLE_STYLE_INV)
     story.append(t_inv)
     story.append(Spacer(1, 1*cm))
 
@@ -1477,12 +1774,10 @@ def create_pdf_report(results, params):
         story.append(PageBreak())
         story.append(Paragraph(title, styles['HeaderStyle']))
         
+        # Werte einmal als ndarray entnehmen statt zeilenweise über iterrows (Series je Zeile)
         data = [["Jahr"] + df.columns.tolist()]
-        for index, row in df.iterrows():
-            formatted_row = [str(index)]
-            for item in row:
-                formatted_row.append(format_euro(item, 0).replace(" €", ""))
-            data.append(formatted_row)
+        data.extend([str(index)] + [format_euro(item, 0).replace(" €", "") for item in row]
+                    for index, row in zip(df.index, df.to_numpy(dtype=np.float64).tolist()))
         
         num_cols = len(df.columns) + 1
         page_width = doc.width
@@ -1496,16 +1791,7 @@ def create_pdf_report(results, params):
 
         t = Table(data, colWidths=col_widths)
         
-        base_style = TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), RL_COLOR_PRIMARY),
-            ('TEXTCOLOR',(0,0),(-1,0),colors.white),
-            ('ALIGN', (1,0), (-1,-1), 'RIGHT'),
-            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0,0), (-1,-1), 9),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 5),
-            ('TOPPADDING', (0,0), (-1,-1), 5),
-            ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-        ])
+        base_style = TableStyle(parent=PDF_TABLE_STYLE_DATAFRAME)
         
         for i in range(1, len(data)):
             if i % 2 == 0:
@@ -1524,19 +1810,13 @@ def create_pdf_report(results, params):
     else:
         df_proj = results['projection_df']
         # 1. Cashflow Tabelle
-        cf_cols = ['Mieteinnahmen (Netto)', 'Betriebskosten', 'Einnahmenüberschuss', 'Annuität Gesamt', 'Cashflow vor Steuer', 'Steuerersparnis', 'Sonderzufluss', 'Cashflow nach Steuer']
-        existing_cf_cols = [col for col in cf_cols if col in df_proj.columns]
-        add_dataframe_to_story(df_proj[existing_cf_cols], "Cashflow-Entwicklung (Werte in EUR)")
+        add_dataframe_to_story(df_proj[CASHFLOW_SPALTEN], "Cashflow-Entwicklung (Werte in EUR)")
 
         # 2. Steuer Tabelle
-        tax_cols = ['Einnahmenüberschuss', 'Zinsen Gesamt', 'AfA Gesamt', 'Steuerliches Ergebnis (V+V)', 'Steuerersparnis']
-        existing_tax_cols = [col for col in tax_cols if col in df_proj.columns]
-        add_dataframe_to_story(df_proj[existing_tax_cols], "Steuerliche Entwicklung (Werte in EUR)")
+        add_dataframe_to_story(df_proj[STEUER_SPALTEN_PDF], "Steuerliche Entwicklung (Werte in EUR)")
         
         # 3. Wertentwicklung
-        value_cols = ['Immobilienwert', 'Restschuld Gesamt', 'Nettovermögen']
-        existing_value_cols = [col for col in value_cols if col in df_proj.columns]
-        add_dataframe_to_story(df_proj[existing_value_cols], "Vermögensentwicklung (Werte in EUR)")
+        add_dataframe_to_story(df_proj[VERMOEGEN_SPALTEN], "Vermögensentwicklung (Werte in EUR)")
     
     # --- Disclaimer (Am Ende des Dokuments) ---
     story.append(Spacer(1, 1*cm))
@@ -1549,11 +1829,24 @@ def create_pdf_report(results, params):
     buffer.seek(0)
     return buffer
 
+
+# Gecacht auf CalcInputs-Snapshot und Berichtsdatum: Reruns ohne Eingabeänderung erzeugen das PDF nicht neu.
+# Das Datum ist Teil des Schlüssels, da es im Bericht ausgewiesen wird.
+@st.cache_data(show_spinner=False, max_entries=32)
+def create_pdf_report_cached(inputs_pct, berichtsdatum):
+    """PDF-Bericht als Bytes für einen CalcInputs-Snapshot (läuft erst beim Klick auf den Download-Button)."""
+    results, params = run_calculations(inputs_pct)
+    pdf_buffer = create_pdf_report(results, params)
+    if pdf_buffer is None:
+        # Kein None als Download-Daten weitergeben; Streamlit protokolliert den Fehler und meldet ihn am Button
+        raise RuntimeError("PDF Export nicht verfügbar: reportlab konnte nicht geladen werden.")
+    return pdf_buffer.getvalue()
+
 # ====================================================================================
 # ERGEBNISANZEIGE (Darstellung der Ergebnisse)
 # ====================================================================================
 
-def display_results(results, params):
+def display_results(results, params, inputs_pct):
     """
     Stellt die berechneten Ergebnisse dar und bietet den PDF-Download an.
     """
@@ -1572,24 +1865,20 @@ def display_results(results, params):
     display_kpi_section(results, params)
 
     # --- PDF Download Button ---
+    # Nur per find_spec prüfen: reportlab wird erst beim Klick in create_pdf_report_cached geladen
+    # (scheitert der Import dort, meldet Streamlit den RuntimeError am Button)
     if PDF_EXPORT_ENABLED:
-        try:
-            with st.spinner("Generiere PDF-Bericht (Querformat)..."):
-                pdf_buffer = create_pdf_report(results, params)
-
-            if pdf_buffer:
-                objekt_name_for_file = params['objekt_name'] if params['objekt_name'] else "Freie_Berechnung"
-                safe_filename = "".join([c for c in objekt_name_for_file if c.isalnum() or c in (' ', '-', '_')]).rstrip().replace(' ', '_')
-                st.download_button(
-                    label="⬇️ Analyse als PDF herunterladen",
-                    data=pdf_buffer,
-                    file_name=f"Park55_Analyse_{safe_filename}.pdf",
-                    mime="application/pdf"
-                )
-        except Exception as e:
-            st.error(f"Fehler bei der PDF-Generierung. Bitte prüfen Sie die Server-Logs.")
-            logging.error("Fehler bei der PDF-Generierung:")
-            logging.error(traceback.format_exc())
+        objekt_name_for_file = params['objekt_name'] if params['objekt_name'] else "Freie_Berechnung"
+        safe_filename = PDF_DATEINAME_UNZULAESSIG.sub('', objekt_name_for_file).rstrip().replace(' ', '_')
+        st.download_button(
+            label="⬇️ Analyse als PDF herunterladen",
+            # Der Bericht wird erst beim Klick erzeugt (nicht bei jedem Rerun)
+            data=partial(create_pdf_report_cached, inputs_pct, datetime.date.today()),
+            file_name=f"Park55_Analyse_{safe_filename}.pdf",
+            mime="application/pdf",
+            # Download ohne Rerun: die Ergebnis-Tabs müssen dafür nicht neu gerendert werden
+            on_click="ignore"
+        )
 
     # --- 2. Tabs für Detailergebnisse ---
     tab_kpis, tab_overview, tab_investment, tab_finance_value, tab_cashflow, tab_tax = st.tabs([
@@ -1723,64 +2012,57 @@ def display_overview(results):
     with col1:
         st.markdown("#### Investitionsvolumen")
         
-        st.markdown('<div class="calculation-breakdown">', unsafe_allow_html=True)
-        st.text(format_aligned_line("GIK Netto:", format_euro(results['gik_netto'], 0)))
-        st.text(format_aligned_line("+ Erwerbsnebenkosten:", format_euro(results['erwerbsnebenkosten'], 0)))
-        st.text(format_aligned_line("+ Kosten Baubegleitung:", format_euro(results['kosten_baubegleitung_gesamt'], 0)))
-        st.markdown('<div class="breakdown-intermediate">', unsafe_allow_html=True)
-        st.text(format_aligned_line("= Investitionssumme:", format_euro(results['investitionssumme_gesamt'], 0)))
-        st.markdown('</div></div>', unsafe_allow_html=True)
+        display_breakdown([
+            format_aligned_line("GIK Netto:", format_euro(results['gik_netto'], 0)),
+            format_aligned_line("+ Erwerbsnebenkosten:", format_euro(results['erwerbsnebenkosten'], 0)),
+            format_aligned_line("+ Kosten Baubegleitung:", format_euro(results['kosten_baubegleitung_gesamt'], 0)),
+            format_aligned_line("= Investitionssumme:", format_euro(results['investitionssumme_gesamt'], 0)),
+        ])
 
     with col2:
         st.markdown("#### Zuschüsse")
-        st.markdown('<div class="calculation-breakdown">', unsafe_allow_html=True)
-        st.text(format_aligned_line("KfW Tilgungszuschuss:", format_euro(results.get('kfw_tilgungszuschuss', 0), 0)))
-        st.text(format_aligned_line("+ KfW BB-Zuschuss:", format_euro(results.get('zuschuss_baubegleitung', 0), 0)))
-        st.text(format_aligned_line("+ Kommunale Förderung:", format_euro(results.get('kommunale_foerderung', 0), 0)))
-        st.markdown('<div class="breakdown-intermediate">', unsafe_allow_html=True)
-        st.text(format_aligned_line("= Gesamtzuschuss:", format_euro(results.get('gesamtzuschuss', 0), 0)))
-        st.markdown('</div></div>', unsafe_allow_html=True)
+        display_breakdown([
+            format_aligned_line("KfW Tilgungszuschuss:", format_euro(results.get('kfw_tilgungszuschuss', 0), 0)),
+            format_aligned_line("+ KfW BB-Zuschuss:", format_euro(results.get('zuschuss_baubegleitung', 0), 0)),
+            format_aligned_line("+ Kommunale Förderung:", format_euro(results.get('kommunale_foerderung', 0), 0)),
+            format_aligned_line("= Gesamtzuschuss:", format_euro(results.get('gesamtzuschuss', 0), 0)),
+        ])
 
 
     with col3:
         st.markdown("#### Finanzierungsstruktur")
-        st.markdown('<div class="calculation-breakdown">', unsafe_allow_html=True)
-        st.text(format_aligned_line("Eigenkapital:", format_euro(results['eigenkapital_bedarf'], 0)))
-        st.text(format_aligned_line("+ Bankdarlehen:", format_euro(results['bankdarlehen'], 0)))
-        st.text(format_aligned_line("+ KfW-Darlehen (Gesamt):", format_euro(results['kfw_darlehen'], 0)))
-        st.markdown('<div class="breakdown-intermediate">', unsafe_allow_html=True)
-        st.text(format_aligned_line("= Summe Finanzierung:", format_euro(results['investitionssumme_gesamt'], 0)))
-        st.markdown('</div></div>', unsafe_allow_html=True)
+        display_breakdown([
+            format_aligned_line("Eigenkapital:", format_euro(results['eigenkapital_bedarf'], 0)),
+            format_aligned_line("+ Bankdarlehen:", format_euro(results['bankdarlehen'], 0)),
+            format_aligned_line("+ KfW-Darlehen (Gesamt):", format_euro(results['kfw_darlehen'], 0)),
+            format_aligned_line("= Summe Finanzierung:", format_euro(results['investitionssumme_gesamt'], 0)),
+        ])
 
 def display_investment_details(results):
     """Details zur Investition und AfA."""
     st.subheader("Investitionsvolumen")
-    st.markdown('<div class="calculation-breakdown">', unsafe_allow_html=True)
     LW = 40
-    st.text(format_aligned_line("Kaufpreis Bestandsimmobilie:", format_euro(results.get('kaufpreis_bestand', 0), 0), LW))
-    st.text(format_aligned_line("+ Sanierungskosten (vor Zuschüssen):", format_euro(results.get('sanierungskosten_vor_zuschuss', 0), 0), LW))
-    st.text(format_aligned_line("+ Kosten Baubegleitung KfW:", format_euro(results.get('kosten_baubegleitung_gesamt', 0), 0), LW))
-    st.markdown("---")
-    st.text(format_aligned_line("= GIK Netto:", format_euro(results.get('gik_netto', 0), 0), LW))
-    st.markdown("---")
-    st.text(format_aligned_line("+ Erwerbsnebenkosten (6,5%):", format_euro(results.get('erwerbsnebenkosten', 0), 0), LW))
-    st.markdown("---")
-    st.text(format_aligned_line("= GIK Brutto / Investitionsvolumen:", format_euro(results.get('gik_brutto', 0), 0), LW))
-    st.markdown('</div>', unsafe_allow_html=True)
+    display_breakdown([
+        format_aligned_line("Kaufpreis Bestandsimmobilie:", format_euro(results.get('kaufpreis_bestand', 0), 0), LW),
+        format_aligned_line("+ Sanierungskosten (vor Zuschüssen):", format_euro(results.get('sanierungskosten_vor_zuschuss', 0), 0), LW),
+        format_aligned_line("+ Kosten Baubegleitung KfW:", format_euro(results.get('kosten_baubegleitung_gesamt', 0), 0), LW),
+        format_aligned_line("= GIK Netto:", format_euro(results.get('gik_netto', 0), 0), LW),
+        format_aligned_line("+ Erwerbsnebenkosten (6,5%):", format_euro(results.get('erwerbsnebenkosten', 0), 0), LW),
+        format_aligned_line("= GIK Brutto / Investitionsvolumen:", format_euro(results.get('gik_brutto', 0), 0), LW),
+    ])
     st.markdown("---")
     st.subheader("AfA-Bemessungsgrundlage (Basis)")
     st.info("Basis (Kauf & GU): Sanierungskosten + Aktivierte Baubegleitung - Zuschüsse (kommunal + KfW-Tilgungszuschuss).")
-    st.markdown('<div class="calculation-breakdown">', unsafe_allow_html=True)
-    st.text(format_aligned_line("Sanierungskosten:", format_euro(results.get('wert_sanierung', 0), 0), LW))
-    st.text(format_aligned_line("+ Aktivierte Baubegleitung (50%):", format_euro(results.get('aktivierung_baubegleitung', 0), 0), LW))
-    st.text(format_aligned_line("= AfA-Basis vor Zuschüssen:", format_euro(results.get('afa_basis_sanierung_vor_foerderung', 0), 0), LW))
-    st.text(format_aligned_line("- Kommunale Förderung:", format_euro(results.get('kommunale_foerderung', 0), 0), LW))
-    st.text(format_aligned_line("- KfW-Tilgungszuschuss (40%):", format_euro(results.get('kfw_tilgungszuschuss', 0), 0), LW))
-    st.markdown("---")
-    st.text(format_aligned_line("= AfA-Basis Sanierung (Denkmal):", format_euro(results.get('afa_basis_sanierung', 0), 0), LW))
-    st.text(format_aligned_line("AfA-Basis Altbau (mit ENK):", format_euro(results.get('afa_basis_altbau', 0), 0), LW))
-    st.text(format_aligned_line("AfA-Basis Grundstück (n.a.):", format_euro(results.get('afa_basis_grundstueck', 0), 0), LW))
-    st.markdown('</div>', unsafe_allow_html=True)
+    display_breakdown([
+        format_aligned_line("Sanierungskosten:", format_euro(results.get('wert_sanierung', 0), 0), LW),
+        format_aligned_line("+ Aktivierte Baubegleitung (50%):", format_euro(results.get('aktivierung_baubegleitung', 0), 0), LW),
+        format_aligned_line("= AfA-Basis vor Zuschüssen:", format_euro(results.get('afa_basis_sanierung_vor_foerderung', 0), 0), LW),
+        format_aligned_line("- Kommunale Förderung:", format_euro(results.get('kommunale_foerderung', 0), 0), LW),
+        format_aligned_line("- KfW-Tilgungszuschuss (40%):", format_euro(results.get('kfw_tilgungszuschuss', 0), 0), LW),
+        format_aligned_line("= AfA-Basis Sanierung (Denkmal):", format_euro(results.get('afa_basis_sanierung', 0), 0), LW),
+        format_aligned_line("AfA-Basis Altbau (mit ENK):", format_euro(results.get('afa_basis_altbau', 0), 0), LW),
+        format_aligned_line("AfA-Basis Grundstück (n.a.):", format_euro(results.get('afa_basis_grundstueck', 0), 0), LW),
+    ])
     if results.get('afa_hinweis'):
         st.warning(results['afa_hinweis'])
     st.markdown("#### Jährliche Abschreibung (AfA)")
@@ -1788,14 +2070,13 @@ def display_investment_details(results):
     df_afa = pd.DataFrame(afa_data)
     st.dataframe(df_afa, width='stretch', hide_index=True)
     st.markdown("#### Zuschüsse")
-    st.markdown('<div class="calculation-breakdown">', unsafe_allow_html=True)
-    st.text(format_aligned_line("Kommunale Förderung:", format_euro(results.get('kommunale_foerderung', 0), 0), LW))
-    st.text(format_aligned_line("KfW-Tilgungszuschuss (40%):", format_euro(results.get('kfw_tilgungszuschuss', 0), 0), LW))
-    st.text(format_aligned_line("KfW BB-Zuschuss (50%):", format_euro(results.get('kfw_zuschuss_bb', 0), 0), LW))
     total_zuschuss = results.get('kommunale_foerderung', 0) + results.get('kfw_tilgungszuschuss', 0) + results.get('kfw_zuschuss_bb', 0)
-    st.markdown("---")
-    st.text(format_aligned_line("= Gesamt Zuschüsse:", format_euro(total_zuschuss, 0), LW))
-    st.markdown('</div>', unsafe_allow_html=True)
+    display_breakdown([
+        format_aligned_line("Kommunale Förderung:", format_euro(results.get('kommunale_foerderung', 0), 0), LW),
+        format_aligned_line("KfW-Tilgungszuschuss (40%):", format_euro(results.get('kfw_tilgungszuschuss', 0), 0), LW),
+        format_aligned_line("KfW BB-Zuschuss (50%):", format_euro(results.get('kfw_zuschuss_bb', 0), 0), LW),
+        format_aligned_line("= Gesamt Zuschüsse:", format_euro(total_zuschuss, 0), LW),
+    ])
 
 
 def display_finance_value_dev(results, params):
@@ -1836,27 +2117,16 @@ def display_finance_value_dev(results, params):
     
     df = results.get('projection_df', pd.DataFrame())
 
-    fin_cols = [
-        'Zins Bank', 'Tilgung Bank', 'Restschuld Bank',
-        'Zins KfW', 'Tilgung KfW', 'Restschuld KfW',
-        'Zinsen Gesamt', 'Tilgung Gesamt', 'Restschuld Gesamt'
-    ]
-    
-    existing_fin_cols = [col for col in fin_cols if col in df.columns]
-
-    if existing_fin_cols:
-        display_dataframe(df[existing_fin_cols])
+    if not df.empty:
+        display_dataframe(df[FINANZIERUNG_SPALTEN])
     else:
         st.info("Keine Finanzierungsdaten vorhanden (z.B. bei 100% Eigenkapital).")
 
     # --- Wertentwicklung ---
     st.subheader("Vermögensentwicklung (Wert vs. Restschuld)")
     
-    value_cols = ['Immobilienwert', 'Restschuld Gesamt', 'Nettovermögen']
-    if all(col in df.columns for col in value_cols):
-        display_dataframe(df[value_cols])
-    elif not df.empty:
-        st.warning("Daten für Wertentwicklung nicht vollständig.")
+    if not df.empty:
+        display_dataframe(df[VERMOEGEN_SPALTEN])
 
     st.info(
         "Wenn Sie die Immobilie als Privatperson erworben haben, können Sie diese nach zehn Jahren steuerfrei veräußern. "
@@ -1869,42 +2139,29 @@ def display_cashflow_details(results):
     st.subheader("Cashflow-Projektion (Jahr 1)")
 
     st.markdown("#### Einnahmen (Jahr 1)")
-    st.markdown('<div class="calculation-breakdown">', unsafe_allow_html=True)
-    st.text(format_aligned_line("Miete Wohnen:", format_euro(results['miete_wohnen_mtl']*12, 0)))
-    st.text(format_aligned_line("+ Miete Keller:", format_euro(results['miete_keller_mtl']*12, 0)))
-    st.text(format_aligned_line("+ Miete Stellplätze:", format_euro(results['miete_stellplatz_mtl']*12, 0)))
-    st.markdown('<div class="breakdown-intermediate">', unsafe_allow_html=True)
-    st.text(format_aligned_line("= Jahreskaltmiete (Brutto):", format_euro(results['jahreskaltmiete'], 0)))
-    st.markdown('</div>', unsafe_allow_html=True)
-    st.text(format_aligned_line("- Sicherheitsabschlag:", format_euro(results['sicherheitsabschlag_absolut'], 0)))
-    st.markdown('<div class="breakdown-intermediate">', unsafe_allow_html=True)
-    st.text(format_aligned_line("= Jahreskaltmiete (Netto):", format_euro(results['jahreskaltmiete_netto'], 0)))
-    st.markdown('</div></div>', unsafe_allow_html=True)
+    display_breakdown([
+        format_aligned_line("Miete Wohnen:", format_euro(results['miete_wohnen_mtl']*12, 0)),
+        format_aligned_line("+ Miete Keller:", format_euro(results['miete_keller_mtl']*12, 0)),
+        format_aligned_line("+ Miete Stellplätze:", format_euro(results['miete_stellplatz_mtl']*12, 0)),
+        format_aligned_line("= Jahreskaltmiete (Brutto):", format_euro(results['jahreskaltmiete'], 0)),
+        format_aligned_line("- Sicherheitsabschlag:", format_euro(results['sicherheitsabschlag_absolut'], 0)),
+        format_aligned_line("= Jahreskaltmiete (Netto):", format_euro(results['jahreskaltmiete_netto'], 0)),
+    ])
 
 
     st.markdown("#### Betriebsergebnis (vor Finanzierung/Steuern, Jahr 1)")
-    st.markdown('<div class="calculation-breakdown">', unsafe_allow_html=True)
-    st.text(format_aligned_line("Jahreskaltmiete (Netto):", format_euro(results['jahreskaltmiete_netto'], 0)))
-    st.text(format_aligned_line("- Verwaltungskosten:", format_euro(results['jahresverwaltungskosten'], 0)))
-    st.markdown('<div class="breakdown-intermediate">', unsafe_allow_html=True)
-    st.text(format_aligned_line("= Einnahmenüberschuss:", format_euro(results['einnahmen_ueberschuss_vor_finanz_steuer'], 0)))
-    st.markdown('</div></div>', unsafe_allow_html=True)
+    display_breakdown([
+        format_aligned_line("Jahreskaltmiete (Netto):", format_euro(results['jahreskaltmiete_netto'], 0)),
+        format_aligned_line("- Verwaltungskosten:", format_euro(results['jahresverwaltungskosten'], 0)),
+        format_aligned_line("= Einnahmenüberschuss:", format_euro(results['einnahmen_ueberschuss_vor_finanz_steuer'], 0)),
+    ])
 
     st.subheader("Cashflow-Tabelle")
     df = results.get('projection_df', pd.DataFrame())
 
     if not df.empty:
         # NEU: Annuität Gesamt (Kapitaldienst) hinzugefügt
-        display_cols = [
-            'Mieteinnahmen (Netto)', 'Betriebskosten', 'Einnahmenüberschuss',
-            'Annuität Gesamt', 'Cashflow vor Steuer', 'Steuerersparnis', 'Sonderzufluss', 'Cashflow nach Steuer'
-        ]
-        existing_cols = [col for col in display_cols if col in df.columns]
-        
-        if existing_cols:
-            display_dataframe(df[existing_cols])
-        else:
-             st.write("Keine Daten verfügbar.")
+        display_dataframe(df[CASHFLOW_SPALTEN])
     else:
         st.write("Keine Daten verfügbar.")
 
@@ -1927,16 +2184,19 @@ def display_tax_details(results):
         haltedauer = 10 # Fallback
 
     if not df.empty:
+        # Kumulierte Summe einmal berechnen; die Werte nach n Jahren sind dann ein Indexzugriff
+        cum_tax_saving = df['Steuerersparnis'].to_numpy().cumsum()
+
         # Kumulation über 12 Jahre
         if len(df) >= 12:
-            cum_tax_saving_12y = df['Steuerersparnis'].head(12).sum()
+            cum_tax_saving_12y = cum_tax_saving[11]
             st.metric(f"Gesamt nach 12 Jahren (Ende Denkmal-AfA)", format_euro(cum_tax_saving_12y, 0))
         
         # Kumulation über Haltedauer
         # Nutzt min(), falls Haltedauer länger als der Berechnungszeitraum ist
         effective_haltedauer = min(haltedauer, len(df))
         if effective_haltedauer > 0:
-            cum_tax_saving_total = df['Steuerersparnis'].head(effective_haltedauer).sum()
+            cum_tax_saving_total = cum_tax_saving[effective_haltedauer - 1]
             st.metric(f"Gesamt nach Haltedauer ({effective_haltedauer} J.)", format_euro(cum_tax_saving_total, 0))
 
 
@@ -1944,36 +2204,18 @@ def display_tax_details(results):
     st.subheader("Detaillierte Steuerberechnung pro Jahr")
     
     if not df.empty:
-        tax_cols = [
-            'Einnahmenüberschuss', 'Zinsen Gesamt',
-            'AfA Denkmal (Sonder)', 'AfA Altbau (Linear)', 'AfA Gesamt',
-            'Steuerliches Ergebnis (V+V)', 'Steuerersparnis'
-        ]
-        
-        existing_tax_cols = [col for col in tax_cols if col in df.columns]
-
-        if existing_tax_cols:
-            display_dataframe(df[existing_tax_cols])
-        else:
-            st.warning("Steuerdaten nicht vollständig.")
+        display_dataframe(df[STEUER_SPALTEN])
 
 # Hilfsfunktion zur robusten Darstellung von DataFrames
 def display_dataframe(df):
     """Helper function to display DataFrames with robust formatting."""
     try:
-        # Use .map for modern Pandas (>= 2.1.0)
-        st.dataframe(df.map(lambda x: format_euro(x, 0) if isinstance(x, (int, float, np.number)) else str(x)))
-    except AttributeError:
-        # Fallback for older pandas versions (.style.format)
-        try:
-            formatter = {col: lambda x: format_euro(x, 0) for col in df.select_dtypes(include=np.number).columns}
-            st.dataframe(df.style.format(formatter))
-        except Exception as e:
-             logging.warning(f"DataFrame styling fallback failed: {e}")
-             st.dataframe(df)
+        # Projektionsspalten sind durchgehend float64: ein Durchlauf über das ndarray statt df.map mit Lambda je Zelle
+        formatiert = [[format_euro(wert, 0) for wert in zeile] for zeile in df.to_numpy(dtype=np.float64).tolist()]
+        st.dataframe(pd.DataFrame(formatiert, index=df.index, columns=df.columns))
     except Exception as e:
         # Absolute Fallback
-        logging.warning(f"DataFrame formatting failed: {e}")
+        logger.warning("DataFrame formatting failed: %s", e)
         st.dataframe(df)
 
 # ====================================================================================
@@ -1987,11 +2229,9 @@ def main():
 
     st.title("Park 55 | Investitionsrechner")
 
-    st.info("Die Berechnung wird automatisch bei jeder Änderung der Eingabeparameter durchgeführt.")
+    st.info("Die Berechnung wird automatisch bei jeder Änderung der Eingabeparameter durchgeführt. Änderungen unter 'Parameter & Prognose' werden mit 'Parameter übernehmen' gesetzt.")
 
     # Optionale Warnings
-    if not IRR_ENABLED:
-        st.error("Modul 'numpy_financial' nicht gefunden. IRR-Berechnung deaktiviert.")
     if not PDF_EXPORT_ENABLED:
         st.warning("PDF Export ist deaktiviert (Modul 'reportlab' fehlt).")
 
@@ -2014,18 +2254,18 @@ def main():
     else:
         # Berechnung durchführen
         try:
-            results, params = run_calculations(st.session_state)
+            calc_inputs = gather_calc_inputs()
+            results, params = run_calculations(calc_inputs)
             # Ergebnisse anzeigen
-            display_results(results, params)
+            display_results(results, params, calc_inputs)
             
         except RuntimeError as e:
             st.error(f"Berechnungsfehler: {e}.")
-            logging.error(traceback.format_exc())
-        except Exception as e:
+            logger.exception("Berechnungsfehler")
+        except Exception:
             # Allgemeine Fehlerbehandlung
-            st.error(f"Ein unerwarteter Fehler ist während der Berechnung aufgetreten.")
-            logging.error("Fehler bei der Berechnung:")
-            logging.error(traceback.format_exc())
+            st.error("Ein unerwarteter Fehler ist während der Berechnung aufgetreten.")
+            logger.exception("Fehler bei der Berechnung")
 
     # Footer Hinweis
     st.markdown("---")
@@ -2035,6 +2275,6 @@ if __name__ == '__main__':
     # Globale Fehlerbehandlung
     try:
         main()
-    except Exception as e:
+    except Exception:
         st.error("Ein unerwarteter technischer Fehler ist aufgetreten.")
-        logging.error(traceback.format_exc())
+        logger.exception("Unerwarteter technischer Fehler")
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+npf = pytest.importorskip("numpy_financial")
+import app  # noqa: E402
+
+
+# Nicht-konventionelle Reihe (Endfälliges Darlehen, negativer Cashflow im Exit-Jahr): zwei Vorzeichenwechsel,
+# Newton ab 0.1 konvergiert hier gegen 278%, npf.irr liefert die Lösung nahe 0 (-11.4%).
+NICHT_KONVENTIONELL = (-59815.0, 218813.0, 20473.0, 20658.0, 20843.0, 21031.0,
+                       21220.0, 21411.0, 21603.0, 21797.0, -157862.0)
+
+KONVENTIONELL = (-100000.0, 5000.0, 5200.0, 5400.0, 5600.0, 125000.0)
+
+
+def test_irr_nicht_konventionell_wie_npf():
+    irr = app.solve_irr(np.array(NICHT_KONVENTIONELL))
+    assert irr == pytest.approx(npf.irr(np.array(NICHT_KONVENTIONELL)), rel=1e-9)
+
+
+def test_irr_konventionell_wie_npf():
+    irr = app.solve_irr(np.array(KONVENTIONELL))
+    assert irr == pytest.approx(npf.irr(np.array(KONVENTIONELL)), rel=1e-9)
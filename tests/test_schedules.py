@@ -0,0 +1,106 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+
+# Erwartete Pläne (Zinsen, Tilgung, Restschuld bzw. Denkmal-AfA, lineare AfA) auf Cent gerundet,
+# erzeugt mit den ursprünglichen Jahresschleifen vor der Umstellung auf geschlossene/vektorisierte Formeln.
+BANK_FAELLE = [
+    # Tilgung läuft in Jahr 9 aus (letzte Rate auf die Restschuld begrenzt), danach 0
+    ((100000.0, 0.05, 0.10, 12), (
+        [5000.0, 4500.0, 3975.0, 3423.75, 2844.94, 2237.18, 1599.04, 929.0, 225.45, 0.0, 0.0, 0.0],
+        [10000.0, 10500.0, 11025.0, 11576.25, 12155.06, 12762.82, 13400.96, 14071.0, 4508.91, 0.0, 0.0, 0.0],
+        [90000.0, 79500.0, 68475.0, 56898.75, 44743.69, 31980.87, 18579.92, 4508.91, 0.0, 0.0, 0.0, 0.0],
+    )),
+    # Zinssatz 0
+    ((60000.0, 0.0, 0.25, 6), (
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+        [15000.0, 15000.0, 15000.0, 15000.0, 0.0, 0.0],
+        [45000.0, 30000.0, 15000.0, 0.0, 0.0, 0.0],
+    )),
+]
+
+KFW_ANNUITAET_FAELLE = [
+    # Ohne tilgungsfreie Jahre: Tilgung ab Jahr 1, Neuberechnung der Annuität nach dem Zuschuss
+    ((150000.0, 0.02, 10, 0, 15000.0, 12), (
+        [3000.0, 2426.02, 2177.32, 1923.64, 1664.89, 1400.96, 1131.75, 857.16, 577.08, 291.4, 0.0, 0.0],
+        [13698.98, 12435.23, 12683.93, 12937.61, 13196.36, 13460.29, 13729.5, 14004.09, 14284.17, 14569.85, 0.0, 0.0],
+        [121301.02, 108865.79, 96181.86, 83244.25, 70047.89, 56587.6, 42858.1, 28854.02, 14569.85, 0.0, 0.0, 0.0],
+    )),
+    # Ein tilgungsfreies Jahr: Tilgung ab Jahr 2 über Laufzeit - 1
+    ((150000.0, 0.02, 10, 1, 15000.0, 12), (
+        [3000.0, 2700.0, 2423.21, 2140.88, 1852.91, 1559.17, 1259.56, 953.96, 642.25, 324.31, 0.0, 0.0],
+        [0.0, 13839.58, 14116.38, 14398.7, 14686.68, 14980.41, 15280.02, 15585.62, 15897.33, 16215.28, 0.0, 0.0],
+        [135000.0, 121160.42, 107044.04, 92645.34, 77958.66, 62978.25, 47698.23, 32112.61, 16215.28, 0.0, 0.0, 0.0],
+    )),
+    # Drei tilgungsfreie Jahre: Annuität ab Jahr 4 auf die Schuld nach Zuschuss
+    ((150000.0, 0.02, 10, 3, 15000.0, 12), (
+        [3000.0, 2700.0, 2700.0, 2700.0, 2336.82, 1966.37, 1588.52, 1203.11, 809.98, 409.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0, 18159.11, 18522.3, 18892.74, 19270.6, 19656.01, 20049.13, 20450.11, 0.0, 0.0],
+        [135000.0, 135000.0, 135000.0, 116840.89, 98318.59, 79425.85, 60155.25, 40499.24, 20450.11, 0.0, 0.0, 0.0],
+    )),
+    # Zinssatz 0
+    ((100000.0, 0.0, 5, 1, 10000.0, 7), (
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+        [0.0, 22500.0, 22500.0, 22500.0, 22500.0, 0.0, 0.0],
+        [90000.0, 67500.0, 45000.0, 22500.0, 0.0, 0.0, 0.0],
+    )),
+    # Laufzeit 1: vollständige Tilgung in Jahr 1
+    ((100000.0, 0.03, 1, 0, 10000.0, 3), (
+        [3000.0, 0.0, 0.0],
+        [100000.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0],
+    )),
+]
+
+KFW_ENDFAELLIG_FAELLE = [
+    ((100000.0, 0.015, 5, 10000.0, 7), (
+        [1500.0, 1350.0, 1350.0, 1350.0, 1350.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0, 0.0, 90000.0, 0.0, 0.0],
+        [90000.0, 90000.0, 90000.0, 90000.0, 0.0, 0.0, 0.0],
+    )),
+    # Laufzeit 1: Fälligkeit in Jahr 1
+    ((100000.0, 0.015, 1, 10000.0, 3), (
+        [1500.0, 0.0, 0.0],
+        [100000.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0],
+    )),
+]
+
+AFA_FAELLE = [
+    ((200000.0, 50000.0, 14), (
+        [18000.0] * 8 + [14000.0] * 4 + [0.0, 0.0],
+        [1000.0] * 14,
+    )),
+]
+
+
+def assert_plan(plan, erwartet):
+    assert len(plan) == len(erwartet)
+    for spalte, erwartete_spalte in zip(plan, erwartet):
+        assert spalte.tolist() == pytest.approx(erwartete_spalte, abs=0.005)
+
+
+@pytest.mark.parametrize("args, erwartet", BANK_FAELLE)
+def test_bankdarlehen_wie_jahresschleife(args, erwartet):
+    assert_plan(app.bank_annuity_schedule(*args), erwartet)
+
+
+@pytest.mark.parametrize("args, erwartet", KFW_ANNUITAET_FAELLE)
+def test_kfw_annuitaet_wie_jahresschleife(args, erwartet):
+    assert_plan(app.kfw_annuity_schedule(*args), erwartet)
+
+
+@pytest.mark.parametrize("args, erwartet", KFW_ENDFAELLIG_FAELLE)
+def test_kfw_endfaellig_wie_jahresschleife(args, erwartet):
+    assert_plan(app.kfw_endfaellig_schedule(*args), erwartet)
+
+
+@pytest.mark.parametrize("args, erwartet", AFA_FAELLE)
+def test_afa_wie_jahresschleife(args, erwartet):
+    assert_plan(app.depreciation_schedule(*args), erwartet)